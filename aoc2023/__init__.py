@@ -1,58 +1,82 @@
-from .day_1.main import main as day_1
-from .day_2.main import main as day_2
-from .day_3.main import main as day_3
-from .day_4.main import main as day_4
-from .day_5.attempt_2 import main as day_5
-from .day_6.main import main as day_6
-from .day_7.main import main as day_7
-from .day_8.main import main as day_8
-from .day_9.main import main as day_9
-from .day_10.main import main as day_10
-from .day_11.main import main as day_11
-from .day_12.main import main as day_12
-from .day_13.main import main as day_13
-from .day_14.main import main as day_14
-from .day_15.main import main as day_15
-# from .day_16.main import main as day_16
-# from .day_17.main import main as day_17
-# from .day_18.main import main as day_18
-# from .day_19.main import main as day_19
-# from .day_20.main import main as day_20
-# from .day_21.main import main as day_21
-# from .day_22.main import main as day_22
-# from .day_23.main import main as day_23
-# from .day_24.main import main as day_24
-# from .day_25.main import main as day_25
-
-DAY_METHODS = [
-    day_1,
-    day_2,
-    day_3,
-    day_4,
-    day_5,
-    day_6,
-    day_7,
-    day_8,
-    day_9,
-    day_10,
-    day_11,
-    day_12,
-    day_13,
-    day_14,
-    day_15,
-    # day_16,
-    # day_17,
-    # day_18,
-    # day_19,
-    # day_20,
-    # day_21,
-    # day_22,
-    # day_23,
-    # day_24,
-    # day_25,
-]
+from collections.abc import Callable, Sequence
+from importlib import import_module
+from time import perf_counter
+from types import ModuleType
+
+# The module holding the solution for each implemented day. Day modules are only imported the first time that day is
+# loaded, so running a single day does not pay for importing every other one.
+DAY_MODULES = {
+    1: 'aoc2023.day_1.main',
+    2: 'aoc2023.day_2.main',
+    3: 'aoc2023.day_3.main',
+    4: 'aoc2023.day_4.main',
+    5: 'aoc2023.day_5.attempt_2',
+    6: 'aoc2023.day_6.main',
+    7: 'aoc2023.day_7.main',
+    8: 'aoc2023.day_8.main',
+    9: 'aoc2023.day_9.main',
+    10: 'aoc2023.day_10.main',
+    11: 'aoc2023.day_11.main',
+    12: 'aoc2023.day_12.main',
+    13: 'aoc2023.day_13.main',
+    14: 'aoc2023.day_14.main',
+    15: 'aoc2023.day_15.main',
+    # 16: 'aoc2023.day_16.main',
+    # 17: 'aoc2023.day_17.main',
+    # 18: 'aoc2023.day_18.main',
+    # 19: 'aoc2023.day_19.main',
+    # 20: 'aoc2023.day_20.main',
+    # 21: 'aoc2023.day_21.main',
+    # 22: 'aoc2023.day_22.main',
+    # 23: 'aoc2023.day_23.main',
+    # 24: 'aoc2023.day_24.main',
+    # 25: 'aoc2023.day_25.main',
+}
+
+
+def load_day(day: int) -> tuple[ModuleType, float]:
+    """Imports the solution module for a day, returning it along with the number of seconds the import took.
+
+    Modules that have already been imported are returned straight from the import system, so only the first load of
+    a day reports a meaningful import time.
+
+    >>> load_day(6)
+    >>> (<module 'aoc2023.day_6.main'>, 0.0004)
+    """
+    if day not in DAY_MODULES:
+        raise ValueError(f"Day {day} has not been implemented.")
+
+    start = perf_counter()
+    module = import_module(DAY_MODULES[day])
+    end = perf_counter()
+
+    return module, end - start
+
+
+class LazyDayMethods(Sequence):
+    """A read-only list of the "main" method of every implemented day, in day order, that only imports a day's module
+    when that day's method is accessed.
+    """
+    def __getitem__(self, i: int | slice) -> Callable[..., None] | list[Callable[..., None]]:
+        days = sorted(DAY_MODULES)
+
+        if isinstance(i, slice):
+            return [load_day(d)[0].main for d in days[i]]
+
+        return load_day(days[i])[0].main
+
+    def __len__(self) -> int:
+        return len(DAY_MODULES)
+
+    def __repr__(self) -> str:
+        return f"<LazyDayMethods days={sorted(DAY_MODULES)}>"
+
+
+DAY_METHODS = LazyDayMethods()
 
 
 __all__ = [
     'DAY_METHODS',
+    'DAY_MODULES',
+    'load_day',
 ]
@@ -1,4 +1,13 @@
-from core.input_reader import get_day_input
+from collections import deque
+from itertools import islice
+from typing import Iterable
+
+from core.solution import DayResult, solve_day
+
+# Every byte other than the numerical digits and newlines, to be deleted from a whole document at once.
+NON_DIGIT_BYTES = bytes(b for b in range(256) if b not in b"0123456789\n")
+# Number of lines streamed into each bulk calibration sum.
+STREAM_CHUNK_LINES = 10000
 
 DIGITS = [
     "zero",
@@ -14,98 +23,140 @@ DIGITS = [
 ]
 
 
-def digits(inp: str) -> str:
-    """Converts a string to only its digit characters.
+def bulk_calibration_sum(document: str) -> int:
+    """Sums the calibration values of every line of a document at once, without looping over the lines in Python.
 
-    >>> digits("test1four3e2test")
-    >>> "132"
-    """
-    return "".join(d for d in inp if d.isdigit())
+    Every byte other than digits and newlines is deleted in one pass, leaving one line of digits per input line. The
+    first digit of every line then directly follows a newline and the last digit directly precedes one, so the sum of
+    the first (and last) digits comes from counting each of "\\n1" to "\\n9" (and "1\\n" to "9\\n"). Lines without any
+    digits add nothing.
 
+    >>> bulk_calibration_sum("1abc2\\npqr3stu8vwx\\na1b2c3d4e5f\\ntreb7uchet")
+    >>> 142
+    """
+    digits = (b"\n" + document.encode() + b"\n").translate(None, NON_DIGIT_BYTES)
 
-def first_last(inp: str) -> int:
-    """Gets the first and last digit from a string as two-digit int.
+    firsts = sum(i * digits.count(b"\n%d" % i) for i in range(1, 10))
+    lasts = sum(i * digits.count(b"%d\n" % i) for i in range(1, 10))
+    return 10 * firsts + lasts
 
-    >>> first_last("test1four3e2test")
-    >>> 12
-    """
-    dgs = digits(inp)
-    return int(dgs[0] + dgs[-1])
 
+def build_digit_automaton(words: dict[str, int]) -> tuple[list[dict[str, int]], list[int | None]]:
+    """Builds an Aho-Corasick automaton that matches every word at once while reading a string one character at a time.
 
-def find_digit_str_pos(inp: str) -> tuple[int | None, int | None]:
-    """Finds the first and last printed digit in a string that can be converted to a numerical digit.
+    Returns the transitions of each state, as a dict of character to next state (any character not in the dict goes
+    back to the starting state 0), and the digit matched on reaching each state, or None.
 
-    >>> find_digit_str_pos("4nineeightseven2")
-    >>> (9, 7)
+    >>> transitions, matches = build_digit_automaton({"one": 1, "1": 1})
+    >>> matches[transitions[transitions[transitions[0]["o"]]["n"]]["e"]]
+    >>> 1
+    """
+    # Build the trie of all words.
+    transitions = [{}]
+    matches = [None]
+    for word, digit in words.items():
+        state = 0
+        for ch in word:
+            if ch not in transitions[state]:
+                transitions.append({})
+                matches.append(None)
+                transitions[state][ch] = len(transitions) - 1
+            state = transitions[state][ch]
+        matches[state] = digit
+
+    # Walk the trie breadth first, filling in the transitions that are missing from each state with the transitions of
+    # its failure state (the state of its longest proper suffix that is also in the trie). This turns the trie into a
+    # complete automaton, so scanning never has to backtrack.
+    fail = [0] * len(transitions)
+    queue = deque(transitions[0].values())
+    while queue:
+        state = queue.popleft()
+        for ch, nxt in transitions[state].items():
+            fail[nxt] = transitions[fail[state]].get(ch, 0) if state else 0
+            # A word ending at the failure state also ends here.
+            if matches[nxt] is None:
+                matches[nxt] = matches[fail[nxt]]
+            queue.append(nxt)
+        for ch, nxt in transitions[fail[state]].items():
+            transitions[state].setdefault(ch, nxt)
+
+    return transitions, matches
+
+
+# Automatons matching numerical and spelled out digits reading forwards, and reading backwards.
+DIGIT_WORDS = {**{word: i for i, word in enumerate(DIGITS)}, **{str(i): i for i in range(10)}}
+FORWARD_DIGITS = build_digit_automaton(DIGIT_WORDS)
+BACKWARD_DIGITS = build_digit_automaton({word[::-1]: i for word, i in DIGIT_WORDS.items()})
+
+
+def scan_digit(chars: Iterable[str], automaton: tuple[list[dict[str, int]], list[int | None]]) -> int | None:
+    """Feeds characters through a digit automaton, returning the first digit completed, or None if there is none.
+
+    As no digit word contains another, the first digit to be completed is also the first one to start.
+
+    >>> scan_digit("xtwone3four", FORWARD_DIGITS)
+    >>> 2
     """
-    # Tracks the position of all digit string indices.
-    firstpos = []
-    lastpos = []
-
-    # Fetches the index of the first occurrence of a digit string representation,
-    # or -1 if that digit string is not present.
-    for v in DIGITS:
-        try:
-            firstpos.append(inp.index(v))
-        except ValueError:
-            firstpos.append(-1)
-        try:
-            lastpos.append(inp.rindex(v))
-        except ValueError:
-            lastpos.append(-1)
-
-    # Fetch the index of the minimum value from the list of positions, with each index
-    # corresponding to its digit, excluding negatives.
-    # E.G. [-1, -1, 1, 3, -1] -> 1, the index of the max value, which means that the string "two"
-    # was the first detection.
-    try:
-        first = firstpos.index(min([p for p in firstpos if p >= 0]))
-    except ValueError:
-        first = None
-
-    try:
-        last = lastpos.index(max(p for p in lastpos if p >= 0))
-    except ValueError:
-        last = None
-
-    return first, last
-
-
-def convert_digit_strings(inp: str) -> str:
-    """Converts the first and last printed digits in strings to numerical digits.
-
-    >>> convert_digit_strings("4nineeightseven2")
-    >>> "49eight72"
+    transitions, matches = automaton
+    state = 0
+    for ch in chars:
+        state = transitions[state].get(ch, 0)
+        if matches[state] is not None:
+            return matches[state]
+    return None
+
+
+def spelled_first_last(inp: str) -> int:
+    """Gets the first and last digit, numerical or spelled out, from a string as a two-digit int, reading the string
+    once from the left and once from the right without rebuilding it. Overlapping words each count, so "eightwo" has a
+    first digit of 8 and a last digit of 2.
+
+    >>> spelled_first_last("eightwo")
+    >>> 82
     """
-    firstpos, lastpos = find_digit_str_pos(inp)
-    if firstpos is not None:
-        inp = inp.replace(DIGITS[firstpos], str(firstpos), 1)
+    return scan_digit(inp, FORWARD_DIGITS) * 10 + scan_digit(reversed(inp), BACKWARD_DIGITS)
 
-    if lastpos is not None:
-        inp = str(lastpos).join(inp.rsplit(DIGITS[lastpos], 1))
 
-    return inp
+# Phases
+def parse(content: str) -> str:
+    """The calibration document is solved as a whole, so it is left as is."""
+    return content
 
 
-def main():
-    # Read Input
-    day = 1
-    lines = get_day_input(day).splitlines()
+def part_1(document: str) -> int:
+    """Sums the calibration values made from the first and last numerical digit of each line."""
+    return bulk_calibration_sum(document)
 
-    # Part 1
+
+def part_2(document: str) -> int:
+    """Sums the calibration values made from the first and last numerical or spelled out digit of each line."""
     tot = 0
-    for line in lines:
-        tot += first_last(line)
+    for line in document.splitlines():
+        tot += spelled_first_last(line)
+    return tot
 
-    print(f"Part 1: {tot}")
 
-    # Part 2
-    tot = 0
-    for line in lines:
-        tot += first_last(convert_digit_strings(line))
+def stream(lines: Iterable[str], part: int | None = None) -> dict[int, int]:
+    """Solves both parts in a single pass over the lines, holding only a chunk of lines at a time so that part 1 can
+    still be summed in bulk.
+    """
+    lines = iter(lines)
+    totals = {1: 0, 2: 0}
+    while chunk := list(islice(lines, STREAM_CHUNK_LINES)):
+        if part in (None, 1):
+            totals[1] += bulk_calibration_sum('\n'.join(chunk))
+        if part in (None, 2):
+            for line in chunk:
+                totals[2] += spelled_first_last(line)
+    return {n: tot for n, tot in totals.items() if part in (None, n)}
+
+
+def solve(content: str | None = None, part: int | None = None) -> DayResult:
+    return solve_day(1, parse, part_1, part_2, content=content, part=part)
+
 
-    print(f"Part 2: {tot}")
+def main(part: int | None = None):
+    print(solve(part=part))
 
 
 if __name__ == "__main__":
@@ -1,4 +1,4 @@
-from core.input_reader import get_day_input
+from core.solution import DayResult, solve_day
 
 
 # Tracks the directions that a pipe segment connects to.
@@ -87,6 +87,10 @@ class Field:
         >>> field.pipe_area()
         >>> 4.0
         """
+        # The first step out of the start is only known once the loop has been walked by pipe_count.
+        if self._first_step is None:
+            self.pipe_count()
+
         self._next = self._first_step
         self._cur = self.start
 
@@ -230,21 +234,28 @@ class Field:
         return from_loc == cls.get_east(to_loc)
 
 
-def main() -> None:
-    # Read Input
-    day = 10
-    lines = get_day_input(day).splitlines()
-    field = Field(pipes=lines)
+# Phases
+def parse(content: str) -> Field:
+    """Reads the field of pipes."""
+    return Field(pipes=content.splitlines())
+
+
+def part_1(field: Field) -> int:
+    """Finds the number of steps to the point of the loop furthest from the start."""
+    return field.pipe_count() // 2
+
+
+def part_2(field: Field) -> int:
+    """Counts the tiles enclosed by the loop."""
+    return round(field.internal_point_count())
 
-    # Part 1
-    furthest_distance = field.pipe_count() / 2
 
-    print(f"Part 1: {furthest_distance:.0f}")
+def solve(content: str | None = None, part: int | None = None) -> DayResult:
+    return solve_day(10, parse, part_1, part_2, content=content, part=part)
 
-    # Part 2
-    contained_pieces = field.internal_point_count()
 
-    print(f"Part 2: {contained_pieces:.0f}")
+def main(part: int | None = None) -> None:
+    print(solve(part=part))
 
 
 if __name__ == "__main__":
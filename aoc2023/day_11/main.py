@@ -1,7 +1,7 @@
 from itertools import combinations
 from typing import Iterator
 
-from core.input_reader import get_day_input
+from core.solution import DayResult, solve_day
 
 GALAXY = "#"
 SPACE = "."
@@ -115,25 +115,33 @@ class Universe:
                 yield (i, j), ch
 
 
-def main() -> None:
-    # Read Input
-    day = 11
-    universe = Universe(get_day_input(day).splitlines())
+# Phases
+def parse(content: str) -> Universe:
+    """Reads the image of the universe."""
+    return Universe(content.splitlines())
 
-    # Part 1
+
+def part_1(universe: Universe) -> int:
+    """Sums the distances between every pair of galaxies, with empty rows and columns doubled."""
     universe.set_expansion_width(2)
     coordinates = universe.galaxy_coordinates()
     # Use the itertools.combinations method to get all pairs of galaxy coordinates, sum the distance between each pair.
-    total_min_dist = sum(Universe.coordinate_distance(*c) for c in combinations(coordinates, 2))
+    return sum(Universe.coordinate_distance(*c) for c in combinations(coordinates, 2))
 
-    print(f"Part 1: {total_min_dist}")
 
-    # Part 2
+def part_2(universe: Universe) -> int:
+    """Sums the distances between every pair of galaxies, with empty rows and columns a million times larger."""
     universe.set_expansion_width(1000000)
     coordinates = universe.galaxy_coordinates()
-    total_min_dist = sum(Universe.coordinate_distance(*c) for c in combinations(coordinates, 2))
+    return sum(Universe.coordinate_distance(*c) for c in combinations(coordinates, 2))
+
+
+def solve(content: str | None = None, part: int | None = None) -> DayResult:
+    return solve_day(11, parse, part_1, part_2, content=content, part=part)
+
 
-    print(f"Part 2: {total_min_dist}")
+def main(part: int | None = None) -> None:
+    print(solve(part=part))
 
 
 if __name__ == "__main__":
@@ -1,4 +1,6 @@
-from core.input_reader import get_day_input
+from typing import Iterable
+
+from core.solution import DayResult, solve_day
 
 SAFE = "."
 BROKEN = "#"
@@ -83,25 +85,57 @@ def unfold(hot_spring: str, blocks: tuple[int]) -> tuple[str, tuple[int, ...]]:
     return UNKNOWN.join([hot_spring] * 5), blocks * 5
 
 
-def main() -> None:
-    # Read Input
-    day = 12
-    lines = get_day_input(day).splitlines()
-    hot_springs = list(map(parse_input, lines))
+# Phases
+def parse(content: str) -> list[tuple[str, tuple[int, ...]]]:
+    """Reads every row of springs and its broken block sizes."""
+    return list(map(parse_input, content.splitlines()))
+
+
+def part_1(hot_springs: list[tuple[str, tuple[int, ...]]]) -> int:
+    """Sums the number of valid arrangements of every row.
 
-    # Part 1
+    The memoization cache is cleared first, so that every run does the full work rather than reusing the answers
+    of an earlier one.
+    """
+    cache.clear()
     val = 0
     for hot_spring in hot_springs:
         val += get_valid_combo_count(*hot_spring)
+    return val
 
-    print(f"Part 1: {val}")
 
-    # Part 2
+def part_2(hot_springs: list[tuple[str, tuple[int, ...]]]) -> int:
+    """Sums the number of valid arrangements of every unfolded row, starting from an empty cache as part 1 does."""
+    cache.clear()
     val = 0
     for hot_spring in hot_springs:
         val += get_valid_combo_count(*unfold(*hot_spring))
+    return val
+
+
+def stream(lines: Iterable[str], part: int | None = None) -> dict[int, int]:
+    """Solves both parts in a single pass over the lines, holding only one row at a time.
+
+    The memoization cache is cleared after every row, as its entries are almost never shared between rows and would
+    otherwise grow with the size of the input.
+    """
+    totals = {1: 0, 2: 0}
+    for line in lines:
+        hot_spring = parse_input(line)
+        if part in (None, 1):
+            totals[1] += get_valid_combo_count(*hot_spring)
+        if part in (None, 2):
+            totals[2] += get_valid_combo_count(*unfold(*hot_spring))
+        cache.clear()
+    return {n: tot for n, tot in totals.items() if part in (None, n)}
+
+
+def solve(content: str | None = None, part: int | None = None) -> DayResult:
+    return solve_day(12, parse, part_1, part_2, content=content, part=part)
+
 
-    print(f"Part 2: {val}")
+def main(part: int | None = None) -> None:
+    print(solve(part=part))
 
 
 if __name__ == "__main__":
@@ -1,4 +1,4 @@
-from core.input_reader import get_day_input
+from core.solution import DayResult, solve_day
 
 
 def transpose(pattern: list[str]) -> list[str]:
@@ -111,24 +111,34 @@ def has_single_difference(pattern: list[str], index: int) -> bool:
     return difference_count == 1
 
 
-def main() -> None:
-    # Read Input
-    day = 13
-    lines = [l.splitlines() for l in get_day_input(day).split("\n\n")]
+# Phases
+def parse(content: str) -> list[list[str]]:
+    """Splits the input into its patterns of rows."""
+    return [l.splitlines() for l in content.split("\n\n")]
 
-    # Part 1
+
+def part_1(patterns: list[list[str]]) -> int:
+    """Sums the symmetry value of every pattern."""
     val = 0
-    for pattern in lines:
+    for pattern in patterns:
         val += find_symmetry_value(pattern)
+    return val
 
-    print(f"Part 1: {val}")
 
-    # Part 2
+def part_2(patterns: list[list[str]]) -> int:
+    """Sums the symmetry value of every pattern once its smudge is fixed."""
     val = 0
-    for pattern in lines:
+    for pattern in patterns:
         val += find_near_symmetry_value(pattern)
+    return val
+
+
+def solve(content: str | None = None, part: int | None = None) -> DayResult:
+    return solve_day(13, parse, part_1, part_2, content=content, part=part)
+
 
-    print(f"Part 2: {val}")
+def main(part: int | None = None) -> None:
+    print(solve(part=part))
 
 
 if __name__ == "__main__":
@@ -1,4 +1,4 @@
-from core.input_reader import get_day_input
+from core.solution import DayResult, solve_day
 
 
 ROUND = "O"
@@ -84,26 +84,34 @@ def cycle(pattern: list[str], count: int) -> list[str]:
     return pattern
 
 
-def main() -> None:
-    # Read Input
-    day = 14
-    lines = get_day_input(day).splitlines()
+# Phases
+def parse(content: str) -> list[str]:
+    """Splits the platform into its rows."""
+    return content.splitlines()
 
-    # Part 1
+
+def part_1(lines: list[str]) -> int:
+    """Evaluates the load on the north beams after tilting the platform north."""
     # Transpose the pattern, then perform the move,
     # then evaluate the load after transposing back.
     pattern = transpose(lines)
     pattern = move(pattern)
-    load = load_eval(transpose(pattern))
+    return load_eval(transpose(pattern))
 
-    print(f"Part 1: {load}")
 
-    # Part 2
+def part_2(lines: list[str]) -> int:
+    """Evaluates the load on the north beams after a billion spin cycles."""
     cycle_count = 1000000000
     pattern = cycle(lines, cycle_count)
-    load = load_eval(pattern)
+    return load_eval(pattern)
+
+
+def solve(content: str | None = None, part: int | None = None) -> DayResult:
+    return solve_day(14, parse, part_1, part_2, content=content, part=part)
+
 
-    print(f"Part 2: {load}")
+def main(part: int | None = None) -> None:
+    print(solve(part=part))
 
 
 if __name__ == "__main__":
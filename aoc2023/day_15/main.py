@@ -1,4 +1,4 @@
-from core.input_reader import get_day_input
+from core.solution import DayResult, solve_day
 
 
 # Processing
@@ -52,21 +52,29 @@ def eval_boxes(boxes: dict[int, dict[str, int]]) -> int:
     return score
 
 
-def main() -> None:
-    # Read Input
-    day = 15
-    sequence = get_day_input(day).split(',')
+# Phases
+def parse(content: str) -> list[str]:
+    """Splits the initialization sequence into its steps."""
+    return content.split(',')
 
-    # Part 1
-    val = sum(map(hash_algorithm, sequence))
 
-    print(f"Part 1: {val}")
+def part_1(sequence: list[str]) -> int:
+    """Sums the HASH of every step."""
+    return sum(map(hash_algorithm, sequence))
 
-    # Part 2
+
+def part_2(sequence: list[str]) -> int:
+    """Evaluates the focusing power of the lenses after running every step."""
     boxes = process_boxes(sequence)
-    val = eval_boxes(boxes)
+    return eval_boxes(boxes)
+
+
+def solve(content: str | None = None, part: int | None = None) -> DayResult:
+    return solve_day(15, parse, part_1, part_2, content=content, part=part)
+
 
-    print(f"Part 2: {val}")
+def main(part: int | None = None) -> None:
+    print(solve(part=part))
 
 
 if __name__ == "__main__":
@@ -1,5 +1,9 @@
-from core.input_reader import get_day_input
-from aoc2023.day_1.main import digits
+import re
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Iterable
+
+from core.solution import DayResult, solve_day
 
 
 CUBE_LIMITS = {
@@ -8,99 +12,183 @@ CUBE_LIMITS = {
     'blue': 14,
 }
 
+COLORS = ('red', 'green', 'blue')
 
-def parse_round(r: str) -> dict[str, int]:
-    """Parses a single round text input into a dict of cube color and count.
-
-    >>> parse_round("1 red, 2 green, 6 blue")
-    >>> {"red": 1, "green": 2, "blue": 6}
-    """
-    rounds = [c.split(' ') for c in r.split(', ')]
-
-    return {color.strip(): int(count) for count, color in rounds}
+GAME_PATTERN = re.compile(r"Game (\d+)")
+COLOR_PATTERNS = {color: re.compile(rf"(\d+) {color}") for color in COLORS}
 
-
-def merge_rounds(rounds: list[dict[str, int]]) -> dict[str, int]:
-    """Gets the maximum number of cubes for each color from a list of rounds,
-    to be used when confirming that a game is possible.
-
-    >>> merge_rounds([{"red": 1, "green": 2, "blue": 6}, {"red": 3}, {"green": 4, "blue": 2}])
-    >>> {"red": 3, "green": 4, "blue": 6}
-    """
-    totals = {}
-    for r in rounds:
-        for color, count in r.items():
-            if color not in totals:
-                totals[color] = count
-            elif totals[color] < count:
-                totals[color] = count
-    return totals
+# The most cells a limit table may have. Past this, limits are answered by scanning the games instead.
+MAX_LIMIT_TABLE_CELLS = 1 << 20
 
 
-def parse_line(line: str) -> tuple[int, dict[str, int]]:
-    """Parses a complete game input line into its game number and the maximum number of cubes seen
-    of each color.
+def parse_line(line: str) -> tuple[int, int, int, int]:
+    """Parses a complete game input line into its game number and the maximum number of red, green and blue cubes
+    seen across all of its rounds. Colors that never appear count as 0.
 
     >>> parse_line("Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green")
-    >>> 1, {"blue": 6, "red": 4, "green": 2}
+    >>> (1, 4, 2, 6)
     """
-    game_seg, round_seg = line.split(': ')
-    game = int(digits(game_seg))
+    game = int(GAME_PATTERN.match(line).group(1))
+    red, green, blue = (max(map(int, COLOR_PATTERNS[color].findall(line)), default=0) for color in COLORS)
+    return game, red, green, blue
 
-    rounds_split = round_seg.split('; ')
-    totals = merge_rounds([parse_round(r) for r in rounds_split])
-    return game, totals
 
+# Processing
+class GameTable:
+    """Holds every game as columns of game numbers and the maximum number of cubes seen of each color, so that any
+    number of cube limit queries can be answered from a single parse.
 
-def is_game_possible(cube_totals: dict[str, int]) -> bool:
-    """Determines if a given game is possible based on the number of cubes known to exist.
-
-    >>> is_game_possible({"blue": 6, "red": 4, "green": 2})
-    >>> True
+    >>> games = GameTable([(1, 4, 2, 6), (2, 1, 3, 4), (3, 20, 13, 6)])
+    >>> games.possible_id_sum(12, 13, 14)
+    >>> 3
     """
-    for color, total in cube_totals.items():
-        if CUBE_LIMITS[color] < total:
-            return False
-
-    return True
-
-
-def multiply_list(vals: list[int]) -> int:
-    """Get the product of all values in a list.
-
-    >>> multiply_list([6, 4, 2])
-    >>> 48
+    ids: list[int]
+    reds: list[int]
+    greens: list[int]
+    blues: list[int]
+
+    # The distinct counts seen of each color, in order, which are the only limits at which the possible games change.
+    _limit_values: tuple[list[int], list[int], list[int]] | None = None
+
+    # Cumulative sums of the game numbers of all games with at most (red, green, blue) cubes, over the distinct counts
+    # of each color, flattened in red, green, blue order. Built the first time a limit is looked up in it, which part 1
+    # never does, as a single limit is cheaper to answer with a scan.
+    _limit_table: list[int] | None = None
+
+    def __init__(self, games: Iterable[tuple[int, int, int, int]]):
+        columns = [list(col) for col in zip(*games)] or [[], [], [], []]
+        self.ids, self.reds, self.greens, self.blues = columns
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def possible_id_sum(self, red: int, green: int, blue: int) -> int:
+        """Sums the game numbers of every game that is possible with the given number of cubes of each color, by
+        scanning the columns once.
+        """
+        return sum(
+            game for game, r, g, b in zip(self.ids, self.reds, self.greens, self.blues)
+            if r <= red and g <= green and b <= blue
+        )
+
+    def power_sum(self) -> int:
+        """Sums the products of the minimum number of cubes of each color needed for each game to be possible."""
+        return sum(r * g * b for r, g, b in zip(self.reds, self.greens, self.blues))
+
+    def limit_values(self) -> tuple[list[int], list[int], list[int]]:
+        """Gets the distinct counts seen of each color, in order, being the dimensions of the limit table."""
+        if self._limit_values is None:
+            self._limit_values = tuple(sorted(set(col)) for col in (self.reds, self.greens, self.blues))
+        return self._limit_values
+
+    def limit_table_size(self) -> int:
+        """The number of cells in the limit table, whether or not it has been built."""
+        reds, greens, blues = self.limit_values()
+        return len(reds) * len(greens) * len(blues)
+
+    def limit_table(self) -> list[int]:
+        """Builds (once) the table of the summed game numbers of all games possible with each combination of the
+        distinct counts seen of each color as the cube limits.
+
+        Each game's number is first added to the cell of its own maxima, then the table is summed cumulatively along
+        each of the three colors in turn, after which every cell holds the sum over all games at or below it.
+        """
+        if self._limit_table is not None:
+            return self._limit_table
+
+        reds, greens, blues = self.limit_values()
+        n_red, n_green, n_blue = len(reds), len(greens), len(blues)
+        table = [0] * (n_red * n_green * n_blue)
+        for game, r, g, b in zip(self.ids, self.reds, self.greens, self.blues):
+            r, g, b = bisect_left(reds, r), bisect_left(greens, g), bisect_left(blues, b)
+            table[(r * n_green + g) * n_blue + b] += game
+
+        # Blue is the innermost dimension, so each run of n_blue cells can be summed on its own.
+        for start in range(0, len(table), n_blue):
+            table[start:start + n_blue] = accumulate(table[start:start + n_blue])
+
+        # Green and red are summed by adding whole rows of the previous index onto the next.
+        for stride, size in ((n_blue, n_green), (n_green * n_blue, n_red)):
+            block = stride * size
+            for start in range(0, len(table), block):
+                for i in range(start + stride, start + block, stride):
+                    table[i:i + stride] = map(int.__add__, table[i:i + stride], table[i - stride:i])
+
+        self._limit_table = table
+        return table
+
+    def limit_id_sum(self, red: int, green: int, blue: int) -> int:
+        """Sums the game numbers of every game that is possible with the given number of cubes of each color with a
+        single lookup in the limit table, building it first if needed. If the table would have more than
+        MAX_LIMIT_TABLE_CELLS cells, the games are scanned instead.
+
+        >>> GameTable([(1, 4, 2, 6), (2, 1, 3, 4), (3, 20, 13, 6)]).limit_id_sum(12, 13, 14)
+        >>> 3
+        """
+        if not self.ids:
+            return 0
+
+        if self.limit_table_size() > MAX_LIMIT_TABLE_CELLS:
+            return self.possible_id_sum(red, green, blue)
+
+        table = self.limit_table()
+        reds, greens, blues = self.limit_values()
+
+        # A limit allows the same games as the largest count seen at or below it. Limits below every count seen of a
+        # color allow no games.
+        r, g, b = bisect_right(reds, red) - 1, bisect_right(greens, green) - 1, bisect_right(blues, blue) - 1
+        if r < 0 or g < 0 or b < 0:
+            return 0
+
+        return table[(r * len(greens) + g) * len(blues) + b]
+
+    def sweep(self, limits: Iterable[tuple[int, int, int]]) -> list[int]:
+        """Sums the game numbers of the possible games for each of many (red, green, blue) cube limits.
+
+        >>> GameTable([(1, 4, 2, 6), (2, 1, 3, 4)]).sweep([(12, 13, 14), (3, 3, 4)])
+        >>> [3, 2]
+        """
+        return [self.limit_id_sum(*limit) for limit in limits]
+
+
+# Phases
+def parse(content: str) -> GameTable:
+    """Parses every game once into a table of its game number and the maximum number of cubes seen of each color."""
+    return GameTable(parse_line(line) for line in content.splitlines())
+
+
+def part_1(games: GameTable) -> int:
+    """Sum the game numbers of all possible games."""
+    return games.possible_id_sum(**CUBE_LIMITS)
+
+
+def part_2(games: GameTable) -> int:
+    """Sum the products of the minimum number of cubes of each color for each game to be viable.
+
+    A game where a color never appears needs 0 cubes of it, so its product (and its share of the sum) is 0.
     """
-    res = vals[0]
-    for i in vals[1:]:
-        res *= i
-    return res
+    return games.power_sum()
 
 
-def main():
-    # Read Input
-    day = 2
-    lines = get_day_input(day).splitlines()
+def stream(lines: Iterable[str], part: int | None = None) -> dict[int, int]:
+    """Solves both parts in a single pass over the lines, holding only one game at a time."""
+    limits = tuple(CUBE_LIMITS[color] for color in COLORS)
 
-    # Part 1
-    # Sum the game numbers of all possible games.
-    tot = 0
+    totals = {1: 0, 2: 0}
     for line in lines:
-        game, cube_totals = parse_line(line)
-        # If the game is possible, add the game number to the running sum.
-        if is_game_possible(cube_totals):
-            tot += game
+        game, red, green, blue = parse_line(line)
+        if red <= limits[0] and green <= limits[1] and blue <= limits[2]:
+            totals[1] += game
+        totals[2] += red * green * blue
+    return {n: tot for n, tot in totals.items() if part in (None, n)}
 
-    print(f"Part 1: {tot}")
 
-    # Part 2
-    # Sum the products of the minimum number of cubes of each color for each game to be viable.
-    tot = 0
-    for line in lines:
-        _, cube_totals = parse_line(line)
-        tot += multiply_list(list(cube_totals.values()))
+def solve(content: str | None = None, part: int | None = None) -> DayResult:
+    return solve_day(2, parse, part_1, part_2, content=content, part=part)
+
 
-    print(f"Part 2: {tot}")
+def main(part: int | None = None):
+    print(solve(part=part))
 
 
 if __name__ == "__main__":
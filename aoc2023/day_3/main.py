@@ -1,6 +1,7 @@
 import re
+from typing import Iterable, NamedTuple
 
-from core.input_reader import get_day_input
+from core.solution import DayResult, solve_day
 
 
 NUM_PATTERN = re.compile(r"\d+")
@@ -21,124 +22,205 @@ def is_symbol(ch: str) -> bool:
     return not any([ch.isdigit(), ch == "."])
 
 
-def parse_numbers(line: str) -> dict[tuple[int, int], int]:
-    """Gets all numbers from a single string, keyed by the indices of that number.
+# Maps every byte of a schematic to b"1" if it is a symbol and b"0" if not, to find all symbols with one translate.
+SYMBOL_BITS = bytes(ord("1") if is_symbol(chr(b)) else ord("0") for b in range(256))
+# The offsets of the eight cells surrounding a cell in a flat grid, as multiples of the row stride and columns.
+NEIGHBOURS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
 
-    >>> parse_numbers("467..114..")
-    >>> {(0, 2): 467, (5, 7): 114}
+
+# Processing
+class Schematic:
+    """Indexes an engine schematic in a single pass, for answering both parts with lookups.
+
+    The rows are laid out one after another in a single flat grid, each followed by an empty "." cell so that cells
+    at the end of one row are never adjacent to the start of the next. Each cell of a number is labelled with that
+    number's id, and every cell on or next to a symbol is marked in the adjacency mask.
+
+    >>> schematic = Schematic("467..114..\\n...*......\\n..35..633.")
+    >>> schematic.values, schematic.adjacent[:11]
+    >>> [467, 114, 35, 633], "00111000000"
     """
-    tokens = {}
+    stride: int
+    size: int
 
-    for match in re.finditer(NUM_PATTERN, line):
-        tokens[(match.start(), match.end()-1)] = int(match.group())
+    # The number, and the flat start and end index of the number, for each number id.
+    values: list[int]
+    spans: list[tuple[int, int]]
 
-    return tokens
+    # The id of the number covering each cell, or -1 for cells outside of numbers.
+    labels: list[int]
 
+    # "1" for every cell on or next to a symbol, and "0" for every other cell.
+    adjacent: str
 
-def parse_gears(line: str) -> list[int]:
-    """Finds the indices of all "gears" (asterisks) in a line.
+    # The flat indices of all "gears" (asterisks).
+    gears: list[int]
 
-    >>> parse_gears("123...*..$..34..*....12..")
-    >>> [6, 16]
-    """
-    tokens = []
+    def __init__(self, content: str):
+        rows = content.splitlines()
+        width = max(map(len, rows), default=0)
+        self.stride = width + 1
+
+        flat = ".".join(row.ljust(width, ".") for row in rows)
+        self.size = len(flat)
+
+        self.values, self.spans = [], []
+        self.labels = [-1] * self.size
+        for i, match in enumerate(NUM_PATTERN.finditer(flat)):
+            self.values.append(int(match.group()))
+            self.spans.append(match.span())
+            self.labels[match.start():match.end()] = [i] * (match.end() - match.start())
+
+        self.adjacent = self.symbol_adjacency(flat)
+        self.gears = [match.start() for match in GEAR_PATTERN.finditer(flat)]
+
+    def symbol_adjacency(self, flat: str) -> str:
+        """Builds the mask of every cell on or next to a symbol in the flat grid, diagonals included.
+
+        The grid is read into one integer with a bit set for every symbol, which is then grown by one cell in every
+        direction (a 3x3 dilation) by or-ing it with copies of itself shifted by one cell and then by one row.
+        """
+        symbols = int(flat.encode().translate(SYMBOL_BITS)[::-1] or b"0", 2)
+
+        near = symbols | symbols << 1 | symbols >> 1
+        near |= near << self.stride | near >> self.stride
+        near &= (1 << self.size) - 1
 
-    for match in re.finditer(GEAR_PATTERN, line):
-        tokens.append(match.start())
+        # Bit i is written last in binary, so the digits are reversed to line up with the flat indices.
+        return format(near, f"0{self.size}b")[::-1] if self.size else ""
 
-    return tokens
+    def part_numbers(self) -> list[int]:
+        """Gets every part number, being every number with at least one cell next to a symbol."""
+        return [num for num, (start, end) in zip(self.values, self.spans) if "1" in self.adjacent[start:end]]
 
+    def gear_numbers(self, gear: int) -> set[int]:
+        """Gets the ids of all numbers next to the gear at the given flat index."""
+        ids = set()
+        for dy, dx in NEIGHBOURS:
+            cell = gear + dy * self.stride + dx
+            if 0 <= cell < self.size:
+                ids.add(self.labels[cell])
 
-def has_adjacent_symbol(lines: list[str], line_index: int, number_indices: tuple[int, int]) -> bool:
-    """Determines whether a symbol is adjacent to the indices of a specific number.
+        ids.discard(-1)
+        return ids
 
-    In the context of the problem, this includes diagonals.
+    def gear_ratios(self) -> list[int]:
+        """Gets the gear ratio of every valid gear, being a gear next to exactly two numbers."""
+        ratios = []
+        for gear in self.gears:
+            ids = self.gear_numbers(gear)
+            if len(ids) == 2:
+                a, b = ids
+                ratios.append(self.values[a] * self.values[b])
+        return ratios
+
+
+class Row(NamedTuple):
+    """A single schematic row indexed for streaming, holding the same information as Schematic for just that row."""
+    values: list[int]
+    spans: list[tuple[int, int]]
+    labels: list[int]
+    symbols: int
+    gears: list[int]
+
+
+EMPTY_ROW = Row([], [], [], 0, [])
+
+
+def index_row(line: str) -> Row:
+    """Indexes the numbers, number labels, symbols and gears of a single row.
+
+    Bit x of the symbols is set if the cell in column x is a symbol.
+
+    >>> index_row("..35*.#")
+    >>> Row(values=[35], spans=[(2, 4)], labels=[-1, -1, 0, 0, -1, -1, -1], symbols=80, gears=[4])
     """
-    line_count = len(lines)
+    values, spans = [], []
+    labels = [-1] * len(line)
+    for i, match in enumerate(NUM_PATTERN.finditer(line)):
+        values.append(int(match.group()))
+        spans.append(match.span())
+        labels[match.start():match.end()] = [i] * (match.end() - match.start())
 
-    # Iterate over the rows one before to one after the line that the number is on.
-    for i in range(line_index - 1, line_index + 2):
-        # Ensure that the row is within bounds.
-        if 0 <= i < line_count:
-            line_len = len(lines[i])
-            # Iterate from the indices one before the number to one after to check for symbols.
-            for x in range(number_indices[0]-1, number_indices[1] + 2):
-                # Ensure the character index is in bounds.
-                if 0 <= x < line_len:
-                    # Check if the character is a symbol.
-                    if is_symbol(lines[i][x]):
-                        return True
+    symbols = int(line.encode().translate(SYMBOL_BITS)[::-1] or b"0", 2)
+    gears = [match.start() for match in GEAR_PATTERN.finditer(line)]
 
-    return False
+    return Row(values, spans, labels, symbols, gears)
 
 
-def part_num_is_adjacent(gear_loc: tuple[int, int], number_loc: tuple[int, tuple[int, int]]) -> bool:
-    """Determines whether a given gear index is within the range of what would be considered "adjacent"
-    to a given part number index.
+def finish_row(above: Row, row: Row, below: Row) -> tuple[int, int]:
+    """Gets the sum of the part numbers and the sum of the gear ratios of a row, given the rows around it."""
+    # Every cell on or next to a symbol in any of the three rows, like the adjacency mask of the whole schematic.
+    near = 0
+    for r in (above, row, below):
+        near |= r.symbols | r.symbols << 1 | r.symbols >> 1
 
-    >>> part_num_is_adjacent((1, 3), (0, (0, 2)))
-    >>> True
+    part_sum = sum(
+        num for num, (start, end) in zip(row.values, row.spans) if near >> start & ((1 << (end - start)) - 1)
+    )
+
+    rows = (above, row, below)
+    ratio_sum = 0
+    for gear in row.gears:
+        # Numbers are only unique within their own row, so they are told apart by their row as well as their id.
+        ids = {
+            (y, r.labels[x]) for y, r in enumerate(rows) for x in (gear - 1, gear, gear + 1)
+            if 0 <= x < len(r.labels) and r.labels[x] != -1
+        }
+        if len(ids) == 2:
+            (y_a, a), (y_b, b) = ids
+            ratio_sum += rows[y_a].values[a] * rows[y_b].values[b]
+
+    return part_sum, ratio_sum
+
+
+# Phases
+def parse(content: str) -> Schematic:
+    """Indexes the numbers, gears and symbol adjacency of the whole schematic once."""
+    return Schematic(content)
+
+
+def part_1(schematic: Schematic) -> int:
+    """Sums every part number, being any number adjacent to a symbol."""
+    return sum(schematic.part_numbers())
+
+
+def part_2(schematic: Schematic) -> int:
+    """Sums the gear ratio of every valid gear."""
+    return sum(schematic.gear_ratios())
+
+
+def stream(lines: Iterable[str], part: int | None = None) -> dict[int, int]:
+    """Solves both parts in a single pass over the lines, holding only a window of three rows at a time.
+
+    Each row is finished once the row below it has been read, as no number or gear can reach any further.
     """
-    # If the line number is not within one line different between the gear and number, they cannot be adjacent.
-    # This performs the "vertical" verification of adjacency.
-    if abs(gear_loc[0] - number_loc[0]) > 1:
-        return False
-
-    # Checks if the indices of any digits in the part number are within one index of the gear index.
-    # This performs the "horizontal" verification of adjacency.
-    return any([abs(gear_loc[1] - n) <= 1 for n in range(number_loc[1][0], number_loc[1][1] + 1)])
-
-
-def check_gear_ratio(numbers: list[dict[tuple[int, int], int]], line_index: int, gear_i: int) -> int:
-    """Checks if a given gear ("*") is considered a valid active gear, then returns the gear ratio
-    of the gear if it is valid, or 0 if it is not."""
-
-    line_count = len(numbers)
-    adj_part_nums = []
-
-    # Iterate from the line before to the line after the gear.
-    for i in range(line_index - 1, line_index + 2):
-        # Ensure line is within bounds
-        if 0 <= i < line_count:
-            # Iterate over all part numbers on the line.
-            for indices, num in numbers[i].items():
-                # Add the part number to the list of part numbers if it is adjacent.
-                if part_num_is_adjacent((line_index, gear_i), (i, indices)):
-                    adj_part_nums.append(num)
-
-    # Valid gears will have exactly 2 adjacent part numbers.
-    if len(adj_part_nums) == 2:
-        # Multiply the part numbers and return the value.
-        return adj_part_nums[0] * adj_part_nums[1]
-
-    # Default return to 0 if there are not exactly 2 adjacent part numbers.
-    return 0
-
-
-def main():
-    # Read Input
-    day = 3
-    lines = get_day_input(day).splitlines()
-
-    # Part 1
-    tot = 0
-    tokens = [parse_numbers(l) for l in lines]
-    for i, token in enumerate(tokens):
-        for indices, num in token.items():
-            if has_adjacent_symbol(lines, i, indices):
-                tot += num
-
-    print(f"Part 1: {tot}")
-
-    # Part 2
-    tot = 0
-    numbers = [parse_numbers(l) for l in lines]
-    tokens = [parse_gears(l) for l in lines]
-    for i, token in enumerate(tokens):
-        for gear_i in token:
-            tot += check_gear_ratio(numbers, i, gear_i)
-
-    print(f"Part 2: {tot}")
+    totals = {1: 0, 2: 0}
+
+    above, row = EMPTY_ROW, None
+    for line in lines:
+        below = index_row(line)
+        if row is not None:
+            part_sum, ratio_sum = finish_row(above, row, below)
+            totals[1] += part_sum
+            totals[2] += ratio_sum
+            above = row
+        row = below
+
+    if row is not None:
+        part_sum, ratio_sum = finish_row(above, row, EMPTY_ROW)
+        totals[1] += part_sum
+        totals[2] += ratio_sum
+
+    return {n: tot for n, tot in totals.items() if part in (None, n)}
+
+
+def solve(content: str | None = None, part: int | None = None) -> DayResult:
+    return solve_day(3, parse, part_1, part_2, content=content, part=part)
+
+
+def main(part: int | None = None):
+    print(solve(part=part))
 
 
 if __name__ == "__main__":
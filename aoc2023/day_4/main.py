@@ -1,25 +1,32 @@
-from core.input_reader import get_day_input
-from aoc2023.day_1.main import digits
+from functools import reduce
+from operator import or_
+from typing import Iterable
+
+from core.solution import DayResult, solve_day
+
+
+# The bit of every number that can appear on a card, which are never more than two digits, keyed by its text.
+NUM_BITS = {str(n): 1 << n for n in range(100)}
 
 
 # Parsing
-def parse_nums(inp: str) -> set[int]:
-    """Convert a string input into a set of integers.
+def parse_nums(inp: str) -> int:
+    """Convert a string input of integers from 0 to 99 into a bitmask, with bit n set for every number n.
 
     >>> parse_nums(" 1 21 53 59 44")
-    >>> {1, 21, 53, 59, 44}
+    >>> 585485543746306050
     """
-    return {int(i) for i in inp.strip().replace("  ", " ").split()}
+    return reduce(or_, map(NUM_BITS.__getitem__, inp.split()), 0)
 
 
-def parse_line(line: str) -> tuple[int, set[int], set[int]]:
-    """Reads the card number as well as the player draws and winning numbers from the input line.
+def parse_line(line: str) -> tuple[int, int, int]:
+    """Reads the card number as well as the bitmasks of the player draws and winning numbers from the input line.
 
     >>> parse_line("Card 3:  1 21 53 59 44 | 69 82 63 72 16 21 14  1")
-    >>> (3, {1, 21, 53, 59, 44}, {69, 82, 63, 72, 16, 21, 14, 1})
+    >>> (3, 585485543746306050, 4841025164123781906644994)
     """
     card_seg, num_seg = line.split(": ")
-    card_num = int(digits(card_seg))
+    card_num = int(card_seg.removeprefix("Card"))
 
     draw_seg, win_seg = num_seg.split(" | ")
 
@@ -29,77 +36,116 @@ def parse_line(line: str) -> tuple[int, set[int], set[int]]:
     return card_num, draws, wins
 
 
+def match_count(line: str) -> int:
+    """Reads a card line and counts how many of the player draws are winning numbers, by and-ing the two bitmasks and
+    counting the bits left set. The card number is never needed, so it is skipped rather than parsed.
+
+    >>> match_count("Card 3:  1 21 53 59 44 | 69 82 63 72 16 21 14  1")
+    >>> 2
+    """
+    draw_seg, win_seg = line.split(":")[1].split("|")
+    return (parse_nums(draw_seg) & parse_nums(win_seg)).bit_count()
+
+
 # Processing
-def determine_card_score(draws: set[int], wins: set[int]) -> int:
-    """Determines the number of items from the player draws that are in the winning numbers.
+def determine_card_score(win_count: int) -> int:
+    """Determines the score of a card from the number of its draws that are winning numbers, starting at 1 and
+    doubling for every winning number after the first.
 
-    >>> determine_card_score({1, 21, 53, 59, 44}, {69, 82, 63, 72, 16, 21, 14, 1})
+    >>> determine_card_score(2)
     >>> 2
     """
-    # Gets the length of the intersections between the draws and the wins.
-    win_count = len(draws & wins)
-    # Returns the related score, starting at 1 and doubling in values for every winning number.
-    return pow(2, win_count-1) if win_count else 0
+    return 1 << win_count >> 1
 
 
-def propagate_cards(cards: dict[int, dict[str, int]], card_num: int | None = None) -> dict[int, dict[str, int]]:
-    """Add the card numbers down the chain according to the rule:
-    Add the "copy" count of the card to the next n cards in the list,
-    n being the count of winning numbers in the current card.
+class CopyCounter:
+    """Counts the cards held as cards are added in order, keeping only the copies already won of the cards to come.
 
-    >>> propagate_cards({1: {"win_count": 1, "copies": 1}, 2: {"win_count": 1, "copies": 1}})
-    >>> {1: {"win_count": 1, "copies": 1}, 2: {"win_count": 1, "copies": 2}}
+    A card can only win copies of the next "win count" cards, so the pending copies are held in a ring buffer one
+    longer than the largest win count seen, which grows if a later card wins more.
+
+    >>> counter = CopyCounter()
+    >>> [counter.add(win_count) for win_count in (4, 2, 2, 1, 0, 0)], counter.total
+    >>> ([1, 2, 4, 8, 14, 1], 30)
     """
-    card_num = card_num or 1
+    # Copies won of each of the upcoming cards, with the next card at the current position.
+    pending: list[int]
+    position: int
+    total: int
 
-    if cards[card_num]['win_count'] >= 0:
-        for i in range(card_num+1, card_num+cards[card_num]['win_count']+1):
-            cards[i]["copies"] += cards[card_num]["copies"]
+    def __init__(self):
+        self.pending = [0]
+        self.position = 0
+        self.total = 0
 
-    if card_num + 1 < len(cards):
-        cards = propagate_cards(cards, card_num + 1)
+    def grow(self, size: int):
+        """Grows the ring buffer to the given size, unrolling it so the next card is back at the start."""
+        self.pending = self.pending[self.position:] + self.pending[:self.position]
+        self.pending.extend([0] * (size - len(self.pending)))
+        self.position = 0
 
-    return cards
+    def add(self, win_count: int) -> int:
+        """Adds the next card, returning how many copies of it are held, and passing those copies on to the cards it
+        wins.
+        """
+        if win_count >= len(self.pending):
+            self.grow(win_count + 1)
 
+        size = len(self.pending)
 
-def total_card_count(cards: dict[int, dict[str, int]]) -> int:
-    """Sums the total number of cards in a stack.
+        # Every card is held once, plus however many copies earlier cards won of it. Its slot is then freed up for
+        # the card "size" places later.
+        copies = 1 + self.pending[self.position]
+        self.pending[self.position] = 0
+        self.total += copies
 
-    >>> total_card_count({1: {"win_count": 1, "copies": 1}, 2: {"win_count": 1, "copies": 2}})
-    >>> 3
-    """
-    tot = 0
-    for card_data in cards.values():
-        tot += card_data['copies']
-    return tot
+        for i in range(self.position + 1, self.position + win_count + 1):
+            self.pending[i % size] += copies
 
+        self.position = (self.position + 1) % size
+        return copies
 
-def main():
-    # Read Input
-    day = 4
-    lines = get_day_input(day).splitlines()
 
-    # Part 1
-    tot = 0
-    for line in lines:
-        _, draws, wins = parse_line(line)
-        tot += determine_card_score(draws, wins)
+# Phases
+def parse(content: str) -> list[int]:
+    """Parses every card into the number of its draws that are winning numbers, which is all both parts need."""
+    return [match_count(line) for line in content.splitlines()]
+
+
+def part_1(win_counts: list[int]) -> int:
+    """Sums the score of every card."""
+    return sum(map(determine_card_score, win_counts))
+
+
+def part_2(win_counts: list[int]) -> int:
+    """Counts the total number of cards once every card's copies have been propagated."""
+    counter = CopyCounter()
+    for win_count in win_counts:
+        counter.add(win_count)
+    return counter.total
 
-    print(f"Part 1: {tot}")
 
-    # Part 2
-    cards = {}
+def stream(lines: Iterable[str], part: int | None = None) -> dict[int, int]:
+    """Solves both parts in a single pass over the cards, holding only one card at a time along with the copies won
+    of the cards still to come.
+    """
+    totals = {1: 0, 2: 0}
+    counter = CopyCounter()
     for line in lines:
-        card, draws, wins = parse_line(line)
-        cards[card] = {
-            "win_count": len(draws & wins),
-            "copies": 1,
-        }
+        win_count = match_count(line)
+        totals[1] += determine_card_score(win_count)
+        counter.add(win_count)
+
+    totals[2] = counter.total
+    return {n: tot for n, tot in totals.items() if part in (None, n)}
+
+
+def solve(content: str | None = None, part: int | None = None) -> DayResult:
+    return solve_day(4, parse, part_1, part_2, content=content, part=part)
 
-    cards = propagate_cards(cards)
-    count = total_card_count(cards)
 
-    print(f"Part 2: {count}")
+def main(part: int | None = None):
+    print(solve(part=part))
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 import re
 
+from aoc2023.day_5.attempt_2 import PiecewiseMap, map_seed_ranges
 from core.input_reader import get_day_input
 
 
@@ -97,6 +98,10 @@ class AlmanacMap:
 
         return self.to_key, val
 
+    def compile(self) -> PiecewiseMap:
+        """Compiles the mapping ranges into sorted pieces for the range engine."""
+        return PiecewiseMap.from_rows([(m.dest_start, m.src_start, m.src_end - m.src_start) for m in self.maps])
+
     def __repr__(self) -> str:
         return f"<AlmanacMap from_key=\"{self.from_key}\" to_key=\"{self.to_key}\">"
 
@@ -142,6 +147,14 @@ class Almanac:
 
         return key, val
 
+    def compiled_stages(self, key: str) -> list[PiecewiseMap]:
+        """Compiles every map followed from a starting key, in order, for walking whole ranges of IDs at once."""
+        stages = []
+        while key in self.almanac_maps:
+            stages.append(self.almanac_maps[key].compile())
+            key = self.almanac_maps[key].to_key
+        return stages
+
     def __repr__(self) -> str:
         return f"<Almanac map_count={self.map_count} map_keys={self.map_keys}>"
 
@@ -176,18 +189,10 @@ def main():
     print(f"Part 1: {val}")
 
     # Part 2
-    val = None
+    # Walking every seed one at a time through the maps technically works, but takes *extremely* long to compute, so
+    # the seed ranges are walked through as whole ranges instead.
     seeds, almanac = parse_input(content)
-
-    # While this technically works, it is a very brute force method and takes *extremely* long to compute.
-    for i in range(0, len(seeds), 2):
-        st = seeds[i]
-        cnt = seeds[i+1]
-        end = st + cnt
-
-        for s in range(st, end):
-           cur = almanac.walk_value_map('seed', s)[1]
-           val = cur if val is None or cur < val else val
+    val = map_seed_ranges(seeds, almanac.compiled_stages('seed'))[0][0]
 
     print(f"Part 2: {val}")
 
@@ -1,4 +1,9 @@
-from core.input_reader import get_day_input
+from bisect import bisect_right
+from itertools import repeat
+from operator import add
+from typing import NamedTuple
+
+from core.solution import DayResult, solve_day
 
 
 # Parsing
@@ -15,97 +20,224 @@ def parse_input(content: str) -> tuple[list[int], list[list[tuple[int, int, int]
 
 
 # Processing
-def map_seeds(seeds: list[int], maps: list[list[tuple[int, int, int]]]) -> list[int]:
-    """Walk the list of seeds forward together as a group through each conversion step.
-
-    >>> map_seeds([10, 5], [[(1, 5, 8)]])
-    >>> [6, 1]
+class PiecewiseMap:
+    """A conversion from one kind of number to another, compiled into sorted pieces that each shift every value from
+    their start up to the start of the next piece by the same offset. The pieces cover every value from 0 upwards, with
+    the values outside of any conversion range covered by pieces with an offset of 0.
+
+    >>> stage = PiecewiseMap.from_rows([(50, 98, 2), (52, 50, 48)])
+    >>> stage.starts, stage.offsets, stage(79)
+    >>> [0, 50, 98, 100], [0, 2, -48, 0], 81
     """
-    # Iterate over each conversion block in the input.
-    for step in maps:
-        stepped_seeds = []
-        # Iterate over each seed to perform this tier of the conversion
-        for s in seeds:
-            # Read the destination, source value, and range length from each conversion range on the step.
-            for dst, src, rng in step:
-                # If the seed number is within the conversion range, perform the conversion.
-                if s in range(src, src + rng):
-                    stepped_seeds.append(dst + s - src)
+    starts: list[int]
+    offsets: list[int]
+
+    def __init__(self, starts: list[int], offsets: list[int]):
+        self.starts = starts
+        self.offsets = offsets
+
+    @classmethod
+    def from_rows(cls, rows: list[tuple[int, int, int]]) -> "PiecewiseMap":
+        """Compiles the destination, source and length rows of a single conversion step, which never overlap."""
+        starts, offsets = [], []
+        end = 0
+        for dst, src, rng in sorted(rows, key=lambda row: row[1]):
+            if rng <= 0:
+                continue
+
+            # Values between the end of the previous row and the start of this one are left unchanged.
+            if src > end:
+                starts.append(end)
+                offsets.append(0)
+
+            starts.append(src)
+            offsets.append(dst - src)
+            end = src + rng
+
+        starts.append(end)
+        offsets.append(0)
+
+        return cls(starts, offsets).coalesced()
+
+    def coalesced(self) -> "PiecewiseMap":
+        """Merges every piece into the piece before it when both shift by the same offset."""
+        starts, offsets = [self.starts[0]], [self.offsets[0]]
+        for start, offset in zip(self.starts[1:], self.offsets[1:]):
+            if offset != offsets[-1]:
+                starts.append(start)
+                offsets.append(offset)
+        return PiecewiseMap(starts, offsets)
+
+    def then(self, other: "PiecewiseMap") -> "PiecewiseMap":
+        """Composes this map with another applied after it into a single map doing both conversions at once.
+
+        Each piece of this map shifts its values onto a span of the other map, which can cross several of the other
+        map's pieces. The piece is split at the starts of those pieces (shifted back by this piece's offset), with
+        each part taking the sum of both offsets.
+
+        >>> PiecewiseMap([0, 10], [5, 0]).then(PiecewiseMap([0, 12], [0, 100])).starts
+        >>> [0, 7, 10, 12]
+        """
+        starts, offsets = [], []
+        for i, (start, offset) in enumerate(zip(self.starts, self.offsets)):
+            end = self.starts[i + 1] if i + 1 < len(self.starts) else None
+
+            # Find the piece of the other map that the first value of this piece is shifted onto.
+            j = bisect_right(other.starts, start + offset) - 1
+            starts.append(start)
+            offsets.append(offset + other.offsets[j])
+
+            # Split at every later piece of the other map that still starts within the shifted piece.
+            for j in range(j + 1, len(other.starts)):
+                split = other.starts[j] - offset
+                if end is not None and split >= end:
                     break
-            # If the loop was not broken, meaning the conversion was not completed,
-            # do not modify the seed value.
-            else:
-                stepped_seeds.append(s)
+                starts.append(split)
+                offsets.append(offset + other.offsets[j])
+
+        return PiecewiseMap(starts, offsets).coalesced()
+
+    def __call__(self, value: int) -> int:
+        """Converts a single value with one binary search for the piece it falls in."""
+        return value + self.offsets[bisect_right(self.starts, value) - 1]
+
+    def map_values(self, values: list[int]) -> list[int]:
+        """Converts many values at once, the same as calling the map on each of them, but as three passes over all
+        the values: searching the sorted starts for the piece of every value, gathering the offsets of those pieces,
+        and adding them on.
+
+        >>> PiecewiseMap.from_rows([(50, 98, 2), (52, 50, 48)]).map_values([79, 14, 55, 13, 99])
+        >>> [81, 14, 57, 13, 51]
+        """
+        # Every value is at least the first start of 0, so the search never returns 0 and the offsets are padded by
+        # one to be indexed by it directly.
+        offsets = [0] + self.offsets
+        pieces = map(bisect_right, repeat(self.starts), values)
+        return list(map(add, values, map(offsets.__getitem__, pieces)))
+
+    def map_ranges(self, ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        """Converts ranges of values, given as their start and length, returning the converted ranges coalesced.
+
+        A range is split wherever it crosses into another piece, finding the piece it starts in with a binary search
+        and then walking on through the pieces after it, with every part shifted by the offset of its piece.
+
+        >>> PiecewiseMap.from_rows([(52, 50, 48)]).map_ranges([(79, 14), (40, 15)])
+        >>> [(40, 10), (52, 5), (81, 14)]
+        """
+        mapped = []
+        for start, rng in ranges:
+            end = start + rng
+            i = bisect_right(self.starts, start) - 1
+            while start < end:
+                split = min(end, self.starts[i + 1]) if i + 1 < len(self.starts) else end
+                mapped.append((start + self.offsets[i], split - start))
+                start = split
+                i += 1
+
+        return coalesce_ranges(mapped)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __repr__(self) -> str:
+        return f"<PiecewiseMap pieces={len(self)}>"
+
+
+def coalesce_ranges(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Sorts ranges of values, given as their start and length, and merges any that overlap or touch, so that the
+    number of ranges can never grow past the number of distinct spans of values.
+
+    >>> coalesce_ranges([(10, 5), (0, 3), (12, 8), (3, 2)])
+    >>> [(0, 5), (10, 10)]
+    """
+    merged = []
+    for start, rng in sorted(ranges):
+        if rng <= 0:
+            continue
 
-            # For the next conversion block, update the seed list
-            # to use the stepped seeds from the current block.
-            seeds = stepped_seeds
+        if merged and start <= merged[-1][0] + merged[-1][1]:
+            prev_start, prev_rng = merged[-1]
+            merged[-1] = (prev_start, max(prev_rng, start + rng - prev_start))
+        else:
+            merged.append((start, rng))
 
-    return seeds
+    return merged
 
 
-def map_seed_ranges(seeds: list[int], maps: list[list[tuple[int, int, int]]]) -> list[tuple[int, int]]:
-    """Walk the list of seed ranges forward together through each conversion step.
+def seed_ranges(seeds: list[int]) -> list[tuple[int, int]]:
+    """Reads the list of seeds as pairs of the start and length of each seed range.
 
-    Each seed range is split up and conversion is applied based on the conversion range it overlaps with:
-    >>> map_seed_ranges([10, 5], [[(1, 5, 8)]])
+    >>> seed_ranges([79, 14, 55, 13])
+    >>> [(79, 14), (55, 13)]
+    """
+    return [(seeds[i], seeds[i + 1]) for i in range(0, len(seeds), 2)]
+
+
+def map_seed_ranges(seeds: list[int], stages: list[PiecewiseMap]) -> list[tuple[int, int]]:
+    """Walk the seed ranges forward together through each compiled conversion step, coalescing the ranges after
+    every step.
+
+    >>> map_seed_ranges([10, 5], [PiecewiseMap.from_rows([(1, 5, 8)])])
     >>> [(6, 3), (13, 2)]
     """
-    # Convert the list of ints into a list of tuples of seed start value and length of the seed range.
-    seed_stack = [(seeds[i], seeds[i+1]) for i in range(0, len(seeds), 2)]
-
-    # Iterate over conversion steps.
-    for i, step in enumerate(maps):
-        stepped_seed_ranges = []
-
-        # Iterate using a stack in order to support splitting overlapping ranges.
-        while seed_stack:
-            s, srng = seed_stack.pop()
-            # Iterate over conversion ranges.
-            for dst, src, rng in step:
-                # Find the potentially overlapping points
-                intersect_start = max(s, src)
-                intersect_end = min(s + srng, src + rng)
-
-                # If there is an overlap, step the seed range using the conversion range.
-                if intersect_start < intersect_end:
-                    stepped_seed_ranges.append((dst + intersect_start - src, intersect_end - intersect_start))
-
-                    # Add any excess seed range back to the stack to process.
-                    if s < intersect_start:
-                        seed_stack.append((s, intersect_start - s))
-                    if s + srng > intersect_end:
-                        seed_stack.append((intersect_end, s + srng - intersect_end))
-                    break
+    ranges = coalesce_ranges(seed_ranges(seeds))
+    for stage in stages:
+        ranges = stage.map_ranges(ranges)
+    return ranges
 
-            # If no overlapping ranges are mapped, append the unmodified range to the list.
-            else:
-                stepped_seed_ranges.append((s, srng))
 
-        # Reset the seed stack with the updated ranges for the next conversion step.
-        seed_stack = stepped_seed_ranges
+def compose_maps(stages: list[PiecewiseMap]) -> PiecewiseMap:
+    """Composes every conversion step, in order, into a single map from the first kind of number to the last."""
+    composed = PiecewiseMap([0], [0])
+    for stage in stages:
+        composed = composed.then(stage)
+    return composed
 
-    return seed_stack
 
+def map_seeds(seeds: list[int], stages: list[PiecewiseMap]) -> list[int]:
+    """Walk the list of seeds forward together as a group through each compiled conversion step.
 
-def main():
-    # Read Input
-    day = 5
-    content = get_day_input(day)
+    >>> map_seeds([10, 5], [PiecewiseMap.from_rows([(1, 5, 8)])])
+    >>> [6, 1]
+    """
+    for stage in stages:
+        seeds = stage.map_values(seeds)
+    return seeds
+
+
+class CompiledAlmanac(NamedTuple):
+    """The almanac with each conversion step compiled, along with all the steps composed into a single map from seed
+    to location."""
+    seeds: list[int]
+    stages: list[PiecewiseMap]
+    location: PiecewiseMap
 
+
+# Phases
+def parse(content: str) -> CompiledAlmanac:
+    """Reads the almanac, then compiles every conversion step and composes them into a single seed to location map."""
     seeds, maps = parse_input(content)
+    stages = [PiecewiseMap.from_rows(step) for step in maps]
+    return CompiledAlmanac(seeds, stages, compose_maps(stages))
+
+
+def part_1(almanac: CompiledAlmanac) -> int:
+    """Finds the lowest location number of any of the listed seeds."""
+    return min(almanac.location.map_values(almanac.seeds))
+
+
+def part_2(almanac: CompiledAlmanac) -> int:
+    """Finds the lowest location number of any seed in the listed seed ranges."""
+    # The mapped ranges come back sorted, so the first one starts at the lowest location.
+    return almanac.location.map_ranges(seed_ranges(almanac.seeds))[0][0]
 
-    # Part 1
-    mapped_seeds = map_seeds(seeds, maps)
-    val = min(mapped_seeds)
 
-    print(f"Part 1: {val}")
+def solve(content: str | None = None, part: int | None = None) -> DayResult:
+    return solve_day(5, parse, part_1, part_2, content=content, part=part)
 
-    # Part 2
-    mapped_seed_ranges = map_seed_ranges(seeds, maps)
-    val = min(sorted(mapped_seed_ranges))[0]
 
-    print(f"Part 2: {val}")
+def main(part: int | None = None):
+    print(solve(part=part))
 
 
 if __name__ == "__main__":
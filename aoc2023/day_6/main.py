@@ -1,6 +1,7 @@
-from math import ceil
+from math import isqrt
+from typing import Iterable
 
-from core.input_reader import get_day_input
+from core.solution import DayResult, solve_day
 from core.util_methods import product
 
 
@@ -32,56 +33,74 @@ def count_winning_times(time: int, record_distance: int) -> int:
     """Counts the number of record-beating times holding the button on the boat
     possible for a race of length time that travels farther than the record_distance.
 
+    This is exact for any size of integers, as it never leaves integer arithmetic.
+
     >>> count_winning_times(7, 9)
-    >>> 2
+    >>> 4
     """
-    min_time = None
+    # The distance peaks when the button is held for half of the race. If even that cannot beat the record, nothing
+    # can.
+    if calculate_distance(time // 2, time) <= record_distance:
+        return 0
+
+    # The winning times held lie strictly between the two roots of h * (time - h) = record_distance, being
+    # (time ± sqrt(time² - 4 * record_distance)) / 2, so the lower root gives the min time held up to rounding.
+    min_time = max(0, (time - isqrt(time * time - 4 * record_distance)) // 2)
+
+    # The integer square root rounds down, so step onto the first winning time held from whichever side it landed.
+    while calculate_distance(min_time, time) <= record_distance:
+        min_time += 1
+    while min_time > 0 and calculate_distance(min_time - 1, time) > record_distance:
+        min_time -= 1
+
+    # By the symmetrical nature of the curve created by plotting out all possible times held, the max time held
+    # that works is the symmetrical value of the min time along the total race time, and every value in between
+    # wins too.
+    return time - 2 * min_time + 1
 
-    # By the symmetrical nature of the curve created by plotting out all possible times held,
-    # it can be determined that we only need to look at half of the times held. This finds
-    # the point at which we can stop iterating, the midpoint.
-    mid_point = ceil((time + 1) / 2)
 
-    for time_held in range(mid_point):
-        # Find the distance travelled at the current amount of time held.
-        if calculate_distance(time_held, time) > record_distance:
-            # Update the minimum time held, then break iteration.
-            min_time = time_held
-            break
+def count_all_winning_times(times: Iterable[int], record_distances: Iterable[int]) -> list[int]:
+    """Counts the number of record-beating times held for each of many races at once.
 
-    # Determine the max time held that works by taking the symmetrical value of the current min time along the
-    # total race time.
-    max_time = time - min_time
+    >>> count_all_winning_times([7, 15, 30], [9, 40, 200])
+    >>> [4, 8, 9]
+    """
+    return list(map(count_winning_times, times, record_distances))
 
-    # Any values in between the two will travel greater distances, so this returns the number of numbers
-    # that fall in the range min_time <= n <= max_time.
-    return max_time - min_time + 1
 
+# Phases
+def parse(content: str) -> tuple[list[int], list[int]]:
+    """Reads the race times and record distances."""
+    time, distance = content.splitlines()
+    return parse_line(time), parse_line(distance)
 
-def main():
-    # Read Input
-    day = 6
-    time, distance = get_day_input(day).splitlines()
-    time = parse_line(time)
-    distance = parse_line(distance)
 
-    # Part 1
+def part_1(races: tuple[list[int], list[int]]) -> int:
+    """Multiplies together the number of winning times of every race."""
+    time, distance = races
     # Get all winning times.
-    winning_time_counts = [count_winning_times(t, d) for t, d in zip(time, distance)]
+    winning_time_counts = count_all_winning_times(time, distance)
     # Multiply the number of winning times for each race together.
-    val = product(winning_time_counts)
+    return product(winning_time_counts)
 
-    print(f"Part 1: {val}")
 
-    # Part 2
+def part_2(races: tuple[list[int], list[int]]) -> int:
+    """Counts the winning times of the single race made by merging every race's digits together."""
+    time, distance = races
     # Merge the parsed winning times and distances into one number.
     time = int(''.join(str(i) for i in time))
     distance = int(''.join(str(i) for i in distance))
 
     # Calculate number of winning times.
-    winning_time_count = count_winning_times(time, distance)
+    return count_winning_times(time, distance)
+
+
+def solve(content: str | None = None, part: int | None = None) -> DayResult:
+    return solve_day(6, parse, part_1, part_2, content=content, part=part)
+
 
-    print(f"Part 2: {winning_time_count}")
+def main(part: int | None = None):
+    print(solve(part=part))
 
 
 if __name__ == "__main__":
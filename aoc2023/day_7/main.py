@@ -1,6 +1,7 @@
 from enum import Enum
+from typing import Iterable, NamedTuple
 
-from core.input_reader import get_day_input
+from core.solution import DayResult, solve_day
 
 
 # Define all possible cards, and can use the indices to order them for scoring.
@@ -20,6 +21,29 @@ class HandType(Enum):
     five_of_a_kind = 6
 
 
+# The score of the hand type of each "count signature", being the number of each different card in a hand, from most
+# to least.
+SIGNATURE_VALUES = {
+    (1, 1, 1, 1, 1): HandType.high_card.value,
+    (2, 1, 1, 1): HandType.one_pair.value,
+    (2, 2, 1): HandType.two_pair.value,
+    (3, 1, 1): HandType.three_of_a_kind.value,
+    (3, 2): HandType.full_house.value,
+    (4, 1): HandType.four_of_a_kind.value,
+    (5,): HandType.five_of_a_kind.value,
+}
+
+# Translate each card to the base 13 digit of its index in the card order, so that a whole hand can be read as one
+# base 13 number in a single call.
+BASE_13_DIGITS = "0123456789abc"
+CARD_DIGITS = str.maketrans(''.join(CARDS), BASE_13_DIGITS)
+PART_2_CARD_DIGITS = str.maketrans(''.join(PART_2_CARDS), BASE_13_DIGITS)
+
+# Every hand of five cards reads as a base 13 number below this, so it is the multiplier of the hand type in a
+# hand's sort key.
+HAND_VALUES = 13 ** 5
+
+
 # Input Parsing
 def parse_line(line: str) -> tuple[str, int]:
     """Reads a single line into a card hand and the big on that hand.
@@ -32,116 +56,239 @@ def parse_line(line: str) -> tuple[str, int]:
 
 
 # Processing
-def character_counts(hand: str) -> dict[str, int]:
-    """Gets the different characters and their occurrence counts for a given hand.
+def hand_signature(hand: str, use_jokers: bool = False) -> tuple[int, ...]:
+    """Gets the count signature of a hand, being the number of each different card in it, from most to least.
+
+    >>> hand_signature("32T3K")
+    >>> (2, 1, 1, 1)
+
+    PART 2:
+    If "use_jokers" is set to True, then the Jokers are added to the highest card count. In this example, "KTJJT"
+    gets treated as "KTTTT". Five Jokers are left as five of a kind.
 
-    >>> character_counts("32T3K")
-    >>> {"3": 2, "2": 1, "T": 1, "K": 1}
+    >>> hand_signature("KTJJT", use_jokers=True)
+    >>> (4, 1)
     """
-    counts = {}
-    for ch in hand:
-        if ch not in counts:
-            counts[ch] = 0
+    jokers = hand.count("J") if use_jokers else 0
+    if jokers == 5:
+        return (5,)
 
-        counts[ch] += 1
+    if jokers:
+        hand = hand.replace("J", "")
 
-    return counts
+    counts = sorted(map(hand.count, set(hand)), reverse=True)
+    counts[0] += jokers
+    return tuple(counts)
 
 
-def get_hand_type(hand: str, use_jokers: bool = False) -> HandType:
-    """Gets the hand type for the given card hand.
+def hand_key(hand: str, use_jokers: bool = False) -> int:
+    """Packs a hand into a single integer sort key for one set of rules, being its hand type followed by its cards
+    read as a base 13 number, so that stronger hands always have larger keys.
 
-    >>> get_hand_type("32T3K")
-    >>> HandType.one_pair
+    >>> hand_key("32T3K")
+    >>> 401230
+    """
+    digits = CARD_DIGITS if not use_jokers else PART_2_CARD_DIGITS
+    return SIGNATURE_VALUES[hand_signature(hand, use_jokers)] * HAND_VALUES + int(hand.translate(digits), 13)
 
-    PART 2:
-    If "use_jokers" is set to True, then add the number of Jokers to the highest card count before processing. In
-    this example, "KTJJT" gets treated as "KTTTT".
 
-    >>> get_hand_type("KTJJT")
-    >>> HandType.four_of_a_kind
+def hand_keys(hand: str) -> tuple[int, int]:
+    """Packs a hand into its sort key for each set of rules at once, sharing the count signature between them when
+    the hand has no Jokers.
+
+    >>> hand_keys("32T3K")
+    >>> (401230, 432170)
     """
-    counts = character_counts(hand)
-
-    # Joker handling
-    # Since 3 and 4 of a kind hands are always worth more than one or two pair hands,
-    # just add the number of jokers to the card count that is the largest and remove the Jokers from the counts.
-    # Also, if all five cards are jokers, we will ignore handling those jokers and leave it as five of a kind.
-    if use_jokers and "J" in counts and not counts["J"] == 5:
-        j_count = counts.pop("J")
-        highest_count = 0
-        highest_char = None
-        for ch, count in counts.items():
-            if highest_char is None or count > highest_count:
-                highest_char, highest_count = ch, count
-
-        counts[highest_char] += j_count
-
-    # '23456'
-    if len(counts) == 5:
-        return HandType.high_card
-    # '22345'
-    elif len(counts) == 4:
-        return HandType.one_pair
-    # '22234' OR '22334'
-    elif len(counts) == 3:
-        return HandType.three_of_a_kind if any(c > 2 for c in counts.values()) else HandType.two_pair
-    # '22223' OR '22233'
-    elif len(counts) == 2:
-        return HandType.four_of_a_kind if any(c > 3 for c in counts.values()) else HandType.full_house
-    # '22222'
-    elif len(counts) == 1:
-        return HandType.five_of_a_kind
-
-
-def hand_to_int(hand: str, use_jokers: bool = False) -> int:
-    """Converts a hand to an integer value by converting every character to a zero padded two digit string and
-    joining them. These can then be used to compare hands with like types to determine a winner.
-
-    # Internally calls 'int("0000000101")', because the 2 card has an index of 0 ("00") and 3 is index 1 ("01")
-    >>> hand_to_int("22233")
-    >>> 101
-
-    >>> hand_to_int("AAAAA")
-    >>> 1212121212
+    signature = hand_signature(hand)
+    part_1_key = SIGNATURE_VALUES[signature] * HAND_VALUES + int(hand.translate(CARD_DIGITS), 13)
+
+    # Without any Jokers, the hand type is the same for both sets of rules.
+    if "J" in hand:
+        signature = hand_signature(hand, use_jokers=True)
+    part_2_key = SIGNATURE_VALUES[signature] * HAND_VALUES + int(hand.translate(PART_2_CARD_DIGITS), 13)
+
+    return part_1_key, part_2_key
+
+
+def total_winnings(keys: list[int], bids: list[int]) -> int:
+    """Ranks the hands by their sort keys and sums each bid multiplied by its rank. Hands with the same key keep
+    their original order.
+
+    >>> total_winnings([401230, 1349585, 1081670], [765, 684, 28])
+    >>> 2873
     """
-    # In part 2, jokers are treated as the lowest scoring card.
-    if use_jokers:
-        return int(''.join(f"{PART_2_CARDS.index(c):-02}" for c in hand))
-    else:
-        return int(''.join(f"{CARDS.index(c):-02}" for c in hand))
-
-
-def main():
-    # Read Input
-    day = 7
-    lines = get_day_input(day).splitlines()
-    hands = list(map(parse_line, lines))
-
-    # Part 1
-    # Sort the hands by a primary key of the value of the HandType and a secondary key of the hand value for like
-    # hand types.
-    sorted_hands = sorted(
-        hands,
-        key=lambda h: (get_hand_type(h[0]).value, hand_to_int(h[0])),
-        reverse=False
-    )
+    # Sort the hand indices by their keys, rather than sorting the keys along with their bids.
+    order = sorted(range(len(keys)), key=keys.__getitem__)
     # Multiply each bid in the sorted hands by its index + 1 and sum the results to get the winnings.
-    winnings = sum((i + 1) * h[1] for i, h in enumerate(sorted_hands))
+    return sum(rank * bids[i] for rank, i in enumerate(order, 1))
+
+
+class FenwickTree:
+    """Sums of values stored at positions from 0 up to a fixed size, where both adding to a position and summing every
+    position below another take O(log n) steps.
+
+    Only the nodes that have been added to are stored, so a tree over a large range of positions costs nothing until
+    it is used.
+
+    >>> tree = FenwickTree(10)
+    >>> tree.add(3, 5); tree.add(7, 2); tree.prefix_sum(7), tree.prefix_sum(8)
+    >>> (5, 7)
+    """
+    size: int
+    nodes: dict[int, int]
+
+    def __init__(self, size: int):
+        self.size = size
+        self.nodes = {}
+
+    def add(self, position: int, value: int):
+        """Adds a value at a position."""
+        # Nodes are numbered from 1, each covering the positions up to it for the length of its lowest set bit.
+        i = position + 1
+        while i <= self.size:
+            self.nodes[i] = self.nodes.get(i, 0) + value
+            i += i & -i
+
+    def prefix_sum(self, position: int) -> int:
+        """Sums the values at every position below the given one."""
+        tot = 0
+        i = position
+        while i > 0:
+            tot += self.nodes.get(i, 0)
+            i -= i & -i
+        return tot
+
+
+class Leaderboard:
+    """Ranks hands as they are added and removed, keeping the total winnings up to date after every change without
+    sorting the hands again.
+
+    Hands are counted (and their bids summed) by sort key in Fenwick trees, so the number of weaker hands and the bids
+    of the stronger hands can be found in O(log n). Adding a hand lifts the rank of every stronger hand by one, adding
+    their bids to the winnings, and removing a hand does the opposite. Hands with the same key are ranked in the order
+    they were added, the same as when sorting.
+
+    Adding a hand is always O(log n). Removing one also looks through the other hands with the same key, making it
+    O(log n + t) for t such hands, so the O(log n) bound does not hold for repeated identical hands, which no real
+    input has.
+
+    >>> board = Leaderboard()
+    >>> board.add("32T3K", 765), board.add("T55J5", 684), board.add("KK677", 28), board.remove("T55J5", 684)
+    >>> (765, 2133, 2873, 821)
+    """
+    use_jokers: bool
+    counts: FenwickTree
+    bid_sums: FenwickTree
+    # The bids of the hands with each sort key, in the order they were added.
+    ties: dict[int, list[int]]
+    hand_count: int
+    total_bids: int
+    winnings: int
+
+    def __init__(self, use_jokers: bool = False):
+        self.use_jokers = use_jokers
+        # Every hand type has a full range of hand values above the one before it.
+        key_count = len(HandType) * HAND_VALUES
+        self.counts = FenwickTree(key_count)
+        self.bid_sums = FenwickTree(key_count)
+        self.ties = {}
+        self.hand_count = 0
+        self.total_bids = 0
+        self.winnings = 0
+
+    def __len__(self) -> int:
+        return self.hand_count
+
+    def add(self, hand: str, bid: int) -> int:
+        """Adds a hand and its bid, returning the total winnings of all hands after adding it."""
+        key = hand_key(hand, self.use_jokers)
+
+        # The hand ranks above every weaker hand and every hand with the same key added before it, and lifts every
+        # stronger hand up one rank.
+        rank = self.counts.prefix_sum(key + 1) + 1
+        stronger_bids = self.total_bids - self.bid_sums.prefix_sum(key + 1)
+        self.winnings += rank * bid + stronger_bids
+
+        self.counts.add(key, 1)
+        self.bid_sums.add(key, bid)
+        self.ties.setdefault(key, []).append(bid)
+        self.hand_count += 1
+        self.total_bids += bid
+        return self.winnings
+
+    def remove(self, hand: str, bid: int) -> int:
+        """Removes the earliest added hand matching the given hand and bid, returning the total winnings of all hands
+        after removing it. Raises a ValueError if there is no such hand. Linear in the number of hands with the same
+        key, as described on the class.
+        """
+        key = hand_key(hand, self.use_jokers)
+        tied_bids = self.ties.get(key, [])
+        if bid not in tied_bids:
+            raise ValueError(f"Hand {hand} with bid {bid} is not on the leaderboard.")
+
+        # Every hand ranked above the removed one drops one rank, including the hands with the same key added after it.
+        i = tied_bids.index(bid)
+        rank = self.counts.prefix_sum(key) + i + 1
+        stronger_bids = self.total_bids - self.bid_sums.prefix_sum(key + 1) + sum(tied_bids[i + 1:])
+        self.winnings -= rank * bid + stronger_bids
+
+        self.counts.add(key, -1)
+        self.bid_sums.add(key, -bid)
+        del tied_bids[i]
+        if not tied_bids:
+            del self.ties[key]
+        self.hand_count -= 1
+        self.total_bids -= bid
+        return self.winnings
+
+
+class Hands(NamedTuple):
+    """The sort key of every hand for both sets of rules, along with their bids."""
+    part_1_keys: list[int]
+    part_2_keys: list[int]
+    bids: list[int]
+
+
+# Phases
+def parse(content: str) -> Hands:
+    """Reads every hand and its bid, packing each hand into its sort keys for both parts in a single pass."""
+    hands, bids = zip(*map(parse_line, content.splitlines())) if content else ((), ())
+    part_1_keys, part_2_keys = zip(*map(hand_keys, hands)) if hands else ((), ())
+    return Hands(list(part_1_keys), list(part_2_keys), list(bids))
+
+
+def part_1(hands: Hands) -> int:
+    """Ranks the hands and sums each bid multiplied by its rank."""
+    return total_winnings(hands.part_1_keys, hands.bids)
+
+
+def part_2(hands: Hands) -> int:
+    """Ranks the hands with "J" cards treated as jokers and sums each bid multiplied by its rank."""
+    return total_winnings(hands.part_2_keys, hands.bids)
+
+
+def stream(lines: Iterable[str], part: int | None = None) -> dict[int, int]:
+    """Solves both parts while reading the hands one line at a time. Ranking needs every hand, so only each hand's
+    sort keys and bid are kept rather than the input text.
+    """
+    keys = {1: [], 2: []}
+    bids = []
+    for line in lines:
+        hand, bid = parse_line(line)
+        part_1_key, part_2_key = hand_keys(hand)
+        keys[1].append(part_1_key)
+        keys[2].append(part_2_key)
+        bids.append(bid)
+
+    return {n: total_winnings(keys[n], bids) for n in (1, 2) if part in (None, n)}
+
 
-    print(f"Part 1: {winnings}")
+def solve(content: str | None = None, part: int | None = None) -> DayResult:
+    return solve_day(7, parse, part_1, part_2, content=content, part=part)
 
-    # Part 2
-    # Perform the same sorting, with the added logic for Jokers.
-    sorted_hands = sorted(
-        hands,
-        key=lambda h: (get_hand_type(h[0], use_jokers=True).value, hand_to_int(h[0], use_jokers=True)),
-        reverse=False
-    )
-    # Multiply the winnings in the same way as part 1.
-    winnings = sum((i + 1) * h[1] for i, h in enumerate(sorted_hands))
 
-    print(f"Part 2: {winnings}")
+def main(part: int | None = None):
+    print(solve(part=part))
 
 
 if __name__ == "__main__":
@@ -1,7 +1,12 @@
 import re
-from math import lcm
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
+from math import gcd, lcm
+from typing import NamedTuple
 
-from core.input_reader import get_day_input
+from core.solution import DayResult, solve_day
 
 
 INPUT_PATTERN = re.compile(r"(?P<loc>.{3}) = \((?P<left>.{3}), (?P<right>.{3})\)")
@@ -25,74 +30,308 @@ def parse_input(content: str) -> tuple[str, dict[str, tuple[str, str]]]:
 
 
 # Processing
-def count_steps_to_target(steps: str, maps: dict[str, tuple[str, str]]) -> int:
+class Network:
+    """The network compiled to integer node ids, with the left and right move of every node held in lists, and the
+    instructions as indices into those moves.
+
+    >>> network = Network("LR", {"AAA": ("AAA", "BBB"), "BBB": ("ZZZ", "AAA"), "ZZZ": ("ZZZ", "ZZZ")})
+    >>> network.names, network.moves, network.instructions
+    >>> ["AAA", "BBB", "ZZZ"], ([0, 2, 2], [1, 0, 2]), [0, 1]
+    """
+    names: list[str]
+    ids: dict[str, int]
+    moves: tuple[list[int], list[int]]
+    instructions: list[int]
+
+    def __init__(self, instructions: str, maps: dict[str, tuple[str, str]]):
+        self.names = list(maps)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.moves = (
+            [self.ids[left] for left, _ in maps.values()],
+            [self.ids[right] for _, right in maps.values()],
+        )
+        self.instructions = [INST_MAP.index(ch) for ch in instructions]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def targets(self, suffix: str) -> list[bool]:
+        """Flags every node whose name ends with the given suffix."""
+        return [name.endswith(suffix) for name in self.names]
+
+    def step(self, node: int, instruction_index: int) -> int:
+        """Moves from a node following the instruction at the given index."""
+        return self.moves[self.instructions[instruction_index % len(self.instructions)]][node]
+
+    def walk_pass(self, node: int, targets: list[bool]) -> tuple[int, list[int]]:
+        """Walks one full pass of the instructions from a node, returning the node it ends on along with how many steps
+        into the pass it is on a target node, for every time it is.
+
+        >>> Network("LR", {"AAA": ("AAA", "BBB"), "BBB": ("ZZZ", "AAA"), "ZZZ": ("ZZZ", "ZZZ")})
+        >>>     .walk_pass(1, [False, False, True])
+        >>> (2, [1, 2])
+        """
+        hits = []
+        for i, instruction in enumerate(self.instructions, 1):
+            node = self.moves[instruction][node]
+            if targets[node]:
+                hits.append(i)
+        return node, hits
+
+    def jump_table(self, targets: list[bool]) -> "JumpTable":
+        """Builds the jump table of the network for a set of target nodes."""
+        return JumpTable(self, targets)
+
+
+class JumpTable:
+    """Binary lifting tables over full passes of the instructions, for a network and a set of target nodes.
+
+    Level k holds where 2^k passes starting from a node end, so that any number of passes can be jumped in one step per
+    set bit. Nothing is built up front: a pass is only walked the first time a walk starts one from its node, and each
+    level only holds the nodes a walk has jumped from, so a short walk costs no more than stepping through it, however
+    large the network is.
+    """
+    network: Network
+    targets: list[bool]
+    jumps: list[dict[int, int]]
+    hits: dict[int, list[int]]
+
+    def __init__(self, network: Network, targets: list[bool]):
+        self.network = network
+        self.targets = targets
+        self.jumps = [{}]
+        self.hits = {}
+
+    def walk_pass(self, node: int) -> tuple[int, list[int]]:
+        """Finds where one pass from a node ends and the steps into it that land on a target, walking it the first time
+        it is asked for."""
+        if node not in self.hits:
+            self.jumps[0][node], self.hits[node] = self.network.walk_pass(node, self.targets)
+        return self.jumps[0][node], self.hits[node]
+
+    def jump(self, node: int, level: int) -> int:
+        """Finds where 2^level passes from a node end."""
+        if level == 0:
+            return self.walk_pass(node)[0]
+
+        while len(self.jumps) <= level:
+            self.jumps.append({})
+        jumps = self.jumps[level]
+        if node not in jumps:
+            # Doing 2^(k-1) passes twice is 2^k passes.
+            jumps[node] = self.jump(self.jump(node, level - 1), level - 1)
+        return jumps[node]
+
+    def walk(self, node: int, steps: int) -> int:
+        """Finds the node reached after the given number of steps from a node, starting from the first instruction.
+
+        >>> Network("LR", {"AAA": ("AAA", "BBB"), "BBB": ("ZZZ", "AAA"), "ZZZ": ("ZZZ", "ZZZ")})
+        >>>     .jump_table([False, False, True]).walk(0, 10 ** 12)
+        >>> 2
+        """
+        passes, remaining = divmod(steps, len(self.network.instructions))
+
+        for k in range(passes.bit_length()):
+            if passes >> k & 1:
+                node = self.jump(node, k)
+
+        for i in range(remaining):
+            node = self.network.step(node, i)
+
+        return node
+
+    def steps_to_target(self, node: int) -> int | None:
+        """Counts the steps from a node, starting from the first instruction, until the walk lands on a target node,
+        or None if it never does.
+
+        The walk goes a pass at a time, so a pass that misses every target is looked up rather than stepped through
+        once it has been walked. It never lands on a target once it is back on a node it already started a pass from.
+        """
+        if self.targets[node]:
+            return 0
+
+        pass_starts = set()
+        while node not in pass_starts:
+            pass_starts.add(node)
+            end, hits = self.walk_pass(node)
+            if hits:
+                return (len(pass_starts) - 1) * len(self.network.instructions) + hits[0]
+            node = end
+
+        return None
+
+
+def count_steps_to_target(network: Network) -> int:
     """Count the number of steps to reach a target "ZZZ" value from a "AAA" starting point using the
-    steps provided and navigating through the maps provided.
+    instructions and moves of the network.
 
-    >>> count_steps_to_target("LR", {"AAA": ("AAA", "BBB"), "BBB": ("ZZZ", "AAA")})
+    >>> count_steps_to_target(Network("LR", {"AAA": ("AAA", "BBB"), "BBB": ("ZZZ", "AAA"), "ZZZ": ("ZZZ", "ZZZ")}))
     >>> 3
     """
-    loc = "AAA"
-    target = "ZZZ"
+    targets = [name == "ZZZ" for name in network.names]
+    return network.jump_table(targets).steps_to_target(network.ids["AAA"])
+
+
+class GhostCycle(NamedTuple):
+    """The cycle a ghost's walk falls into, in steps. The walk is on a target at every step in the tail hits, which
+    are all before the tail ends, and at every step in the cycle hits plus any multiple of the period."""
+    start: int
+    tail: int
+    period: int
+    tail_hits: list[int]
+    cycle_hits: list[int]
+
+    def is_hit(self, step: int) -> bool:
+        """Whether the walk is on a target after the given number of steps."""
+        if step < self.tail:
+            return step in self.tail_hits
+        return self.tail + (step - self.tail) % self.period in self.cycle_hits
+
+
+def find_ghost_cycle(network: Network, targets: list[bool], start: int) -> GhostCycle:
+    """Finds the cycle of the walk from a starting node, along with every step it lands on a target before repeating.
+
+    The state of a walk is its node and its instruction index, so it repeats once it is back on a node it started a
+    pass from. The walk goes a pass at a time until then, so every pass it makes is walked exactly once, and no other.
+
+    This is the unit of work for finding every ghost's cycle in parallel, so it has to stay a module level function
+    for the process pool to be able to send it to the workers, and takes only the network and the targets to keep what
+    is sent to them small.
+    """
+    instruction_count = len(network.instructions)
+
+    # Follow the passes until a node repeats, which starts the cycle.
+    pass_starts = {}
+    hits = [0] if targets[start] else []
+    node = start
+    while node not in pass_starts:
+        n = pass_starts[node] = len(pass_starts)
+        node, pass_hits = network.walk_pass(node, targets)
+        hits.extend(n * instruction_count + i for i in pass_hits)
+    tail, period = pass_starts[node] * instruction_count, (len(pass_starts) - pass_starts[node]) * instruction_count
+
+    # The last pass ends back on the first step of the cycle, which is already counted as the cycle's first step.
+    return GhostCycle(
+        start,
+        tail,
+        period,
+        [h for h in hits if h < tail],
+        [h for h in hits if tail <= h < tail + period],
+    )
+
+
+def combine_congruences(a: int, m: int, b: int, n: int) -> int | None:
+    """Finds the smallest non-negative x where x = a (mod m) and x = b (mod n), which repeats every lcm(m, n), or None
+    if no such x exists. The moduli do not need to be coprime.
+
+    >>> combine_congruences(2, 4, 4, 6)
+    >>> 10
+    """
+    g = gcd(m, n)
+    if (b - a) % g:
+        return None
+
+    # Step a forward by multiples of m until it also lands on b modulo n.
+    k = (b - a) // g * pow(m // g, -1, n // g) % (n // g)
+    return (a + m * k) % lcm(m, n)
+
 
-    total_steps = len(steps)
-    step_count = 0
+def first_common_hit(cycles: list[GhostCycle]) -> int | None:
+    """Finds the first step at which every walk is on a target at the same time, or None if that never happens.
+
+    Before the longest tail ends, the answer can only be one of the tail hits of the ghost with that tail, each of
+    which is checked against every other ghost. After it, every walk is in its cycle, so the steps on which all of them
+    are on a target are found by sieving the cycle hits of each ghost in turn through the Chinese remainder theorem.
+
+    With no walks at all, every one of them is on a target from the start, so the answer is 0.
+    """
+    if not cycles:
+        return 0
 
-    while loc != target:
-        loc = maps[loc][0 if steps[step_count % total_steps] == "L" else 1]
-        step_count += 1
+    longest = max(cycles, key=lambda cycle: cycle.tail)
+    for step in longest.tail_hits:
+        if all(cycle.is_hit(step) for cycle in cycles):
+            return step
 
-    return step_count
+    # Every step still possible, as remainders modulo the lcm of the periods combined so far.
+    modulus, remainders = 1, {0}
+    for cycle in cycles:
+        hit_remainders = {h % cycle.period for h in cycle.cycle_hits}
+        remainders = {
+            x for r in remainders for h in hit_remainders
+            if (x := combine_congruences(r, modulus, h, cycle.period)) is not None
+        }
+        modulus = lcm(modulus, cycle.period)
 
+    if not remainders:
+        return None
 
-def count_grouped_steps_to_target(steps: str, maps: dict[str, tuple[str, str]]) -> int:
+    # Take the first step with each remainder from the end of the longest tail onwards.
+    return min(r + max(0, -(-(longest.tail - r) // modulus)) * modulus for r in remainders)
+
+
+def count_grouped_steps_to_target(network: Network, workers: int | None = None) -> int | None:
     """Check the number of steps to for all values in the map that end in "A" to all reach values in the map that
     end in "Z" at the same time.
 
-    The observation that can be made here is that each starting value takes a certain number of steps to reach
-    a value ending in Z, then cycles back to the start of its rotation. So by checking the number of steps
-    to reach a value ending in Z for all values ending in A, then we can take the lowest common multiple
-    of those step counts to get the total number of steps required.
+    Each ghost's walk runs into a cycle, possibly after a tail, landing on values ending in Z at fixed offsets into
+    it. The first step that is one of those offsets for every ghost at once is the answer, which is exact for any
+    network, and not only those where each ghost reaches a Z once per cycle at a clean multiple of its period.
 
-    >>> # I don't feel like typing out a complete example for this one.
+    With workers set, the cycles of the ghosts are found in parallel across a pool of worker processes. Each cycle
+    only walks the ghost's own loop once, so this only pays off for networks much larger than the real input.
     """
-    # Get all values ending with "A" to start from.
-    locs = [m for m in maps if m.endswith("A")]
-    counts_to_hit_z = []
+    starts = [node for node, start in enumerate(network.targets("A")) if start]
+    shared = (network, network.targets("Z"))
+
+    if workers is not None and starts:
+        # Each worker gets a single chunk of ghosts, so the network is only pickled once per worker.
+        chunk_size = -(-len(starts) // workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            cycles = list(executor.map(find_ghost_cycle, *map(repeat, shared), starts, chunksize=chunk_size))
+    else:
+        cycles = [find_ghost_cycle(*shared, start) for start in starts]
+
+    return first_common_hit(cycles)
+
 
-    total_steps = len(steps)
+# Phases
+def parse(content: str) -> Network:
+    """Reads the instructions and the network, and compiles them to integer node ids."""
+    return Network(*parse_input(content))
 
-    # Get the number of steps to hit a value ending in "Z" for all starting values.
-    for starting_loc in locs:
-        step_count = 0
 
-        loc = starting_loc
-        while not loc.endswith("Z"):
-            loc = maps[loc][0 if steps[step_count % total_steps] == "L" else 1]
-            step_count += 1
+def part_1(network: Network) -> int:
+    """Counts the steps from "AAA" to "ZZZ"."""
+    return count_steps_to_target(network)
 
-        counts_to_hit_z.append(step_count)
 
-    # Return the lowest common multiple.
-    return lcm(*counts_to_hit_z)
+def part_2(network: Network, workers: int | None = None) -> int:
+    """Counts the steps until every node ending in "A" is on a node ending in "Z" at the same time, finding the cycle
+    of each ghost across a pool of that many worker processes if workers is set."""
+    return count_grouped_steps_to_target(network, workers=workers)
 
 
-def main() -> None:
-    # Read Input
-    day = 8
-    content = get_day_input(day)
-    instructions, maps = parse_input(content)
+def solve(content: str | None = None, part: int | None = None, workers: int | None = None) -> DayResult:
+    return solve_day(8, parse, part_1, partial(part_2, workers=workers), content=content, part=part)
 
-    # Part 1
-    step_count = count_steps_to_target(instructions, maps)
 
-    print(f"Part 1: {step_count}")
+def main(part: int | None = None, workers: int | None = None) -> None:
+    print(solve(part=part, workers=workers))
 
-    # Part 2
-    step_count = count_grouped_steps_to_target(instructions, maps)
 
-    print(f"Part 2: {step_count}")
+def parse_args():
+    parser = ArgumentParser(description="Solve day 8.")
+    parser.add_argument("--part", type=int, choices=(1, 2), default=None, help="Only solve the given part.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Find the ghost cycles of part 2 across this many worker processes. Defaults to solving in-process.",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(part=args.part, workers=args.workers)
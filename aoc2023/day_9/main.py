@@ -1,4 +1,6 @@
-from core.input_reader import get_day_input
+from typing import Iterable
+
+from core.solution import DayResult, solve_day
 
 
 # Input Parsing
@@ -64,25 +66,46 @@ def find_previous_value(pattern: list[int]) -> int:
     return sum(final_vals)
 
 
-def main() -> None:
-    # Read Input
-    day = 9
-    lines = get_day_input(day).splitlines()
-    patterns = list(map(parse_line, lines))
+# Phases
+def parse(content: str) -> list[list[int]]:
+    """Reads every history into a list of values."""
+    return list(map(parse_line, content.splitlines()))
+
 
-    # Part 1
+def part_1(patterns: list[list[int]]) -> int:
+    """Sums the next value of every history."""
     val = 0
     for pattern in patterns:
         val += find_next_value(pattern)
+    return val
 
-    print(f"Part 1: {val}")
 
-    # Part 2
+def part_2(patterns: list[list[int]]) -> int:
+    """Sums the previous value of every history."""
     val = 0
     for pattern in patterns:
         val += find_previous_value(pattern)
+    return val
+
+
+def stream(lines: Iterable[str], part: int | None = None) -> dict[int, int]:
+    """Solves both parts in a single pass over the lines, holding only one history at a time."""
+    totals = {1: 0, 2: 0}
+    for line in lines:
+        pattern = parse_line(line)
+        if part in (None, 1):
+            totals[1] += find_next_value(pattern)
+        if part in (None, 2):
+            totals[2] += find_previous_value(pattern)
+    return {n: tot for n, tot in totals.items() if part in (None, n)}
+
+
+def solve(content: str | None = None, part: int | None = None) -> DayResult:
+    return solve_day(9, parse, part_1, part_2, content=content, part=part)
+
 
-    print(f"Part 2: {val}")
+def main(part: int | None = None) -> None:
+    print(solve(part=part))
 
 
 if __name__ == "__main__":
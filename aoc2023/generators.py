@@ -0,0 +1,486 @@
+"""Generators for synthetic puzzle inputs of every implemented day, used to test the solutions at much larger sizes
+than the real inputs.
+
+Every generator takes a scale and a random number generator. The scale multiplies the amount of input relative to a
+real puzzle input: the number of lines (or games, cards, hands, steps...) for line oriented days, and the area of the
+grid for grid based days, so a scale of 100 gives a grid with 10 times the width and height.
+"""
+import string
+import warnings
+from argparse import ArgumentParser
+from math import isqrt
+from os import makedirs, path
+from random import Random
+from typing import Callable
+
+from aoc2023.day_13.main import has_symmetry, has_single_difference, transpose
+from core.input_reader import write_atomic
+from core.util_methods import parse_int_list
+
+
+def scaled(base: int, scale: float) -> int:
+    """Scales a line or item count, never going below 1."""
+    return max(1, round(base * scale))
+
+
+def scaled_side(base: int, scale: float) -> int:
+    """Scales the side of a square grid so that its area grows with the scale."""
+    return max(1, round(base * scale ** 0.5))
+
+
+# Day 1
+DIGIT_WORDS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+
+def generate_day_1(scale: float, rng: Random) -> str:
+    """Lines of letters mixed with spelled out and numerical digits, with at least one numerical digit on each line."""
+    lines = []
+    for _ in range(scaled(1000, scale)):
+        tokens = [str(rng.randint(1, 9))]
+        for _ in range(rng.randint(1, 8)):
+            roll = rng.random()
+            if roll < 0.3:
+                tokens.append(rng.choice(DIGIT_WORDS))
+            elif roll < 0.5:
+                tokens.append(str(rng.randint(1, 9)))
+            else:
+                tokens.append(''.join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 5))))
+        rng.shuffle(tokens)
+        lines.append(''.join(tokens))
+    return '\n'.join(lines)
+
+
+# Day 2
+def generate_day_2(scale: float, rng: Random) -> str:
+    """Games of 1 to 6 rounds, each drawing between 1 and 20 cubes of up to three colors."""
+    lines = []
+    for game in range(1, scaled(100, scale) + 1):
+        rounds = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            rounds.append(', '.join(f"{rng.randint(1, 20)} {color}" for color in colors))
+        lines.append(f"Game {game}: {'; '.join(rounds)}")
+    return '\n'.join(lines)
+
+
+# Day 3
+SYMBOLS = "*#+$/@=%-&"
+
+
+def generate_day_3(scale: float, rng: Random) -> str:
+    """A schematic of numbers of 1 to 3 digits and symbols (with a good share of gears) scattered over empty space."""
+    side = scaled_side(140, scale)
+    rows = []
+    for _ in range(side):
+        row = []
+        while len(row) < side:
+            roll = rng.random()
+            if roll < 0.12:
+                row.extend(str(rng.randint(1, 999)))
+                row.append('.')
+            elif roll < 0.16:
+                row.append('*' if rng.random() < 0.4 else rng.choice(SYMBOLS))
+            else:
+                row.append('.')
+        rows.append(''.join(row[:side]))
+    return '\n'.join(rows)
+
+
+# Day 4
+def generate_day_4(scale: float, rng: Random) -> str:
+    """Cards of 10 drawn and 25 winning numbers between 1 and 99. As in the real input, no card wins copies of cards
+    past the end of the table.
+    """
+    count = scaled(200, scale)
+    width = len(str(count))
+    lines = []
+    for card in range(1, count + 1):
+        # Most cards win a few matches, only some win many.
+        matches = min(count - card, rng.choice([0, 0, 0, 1, 1, 2, 2, 3, 4, 5, 6, 8, 10]))
+        nums = rng.sample(range(1, 100), 35 - matches)
+        draws = nums[:matches] + nums[matches:10]
+        wins = nums[:matches] + nums[10:]
+        rng.shuffle(draws)
+        rng.shuffle(wins)
+        lines.append(
+            f"Card {card:>{width}}: {' '.join(f'{n:>2}' for n in draws)} | {' '.join(f'{n:>2}' for n in wins)}"
+        )
+    return '\n'.join(lines)
+
+
+# Day 5
+ALMANAC_KEYS = ["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location"]
+
+
+def generate_day_5(scale: float, rng: Random) -> str:
+    """Seed ranges and seven maps, each map being a shuffle of consecutive ranges over the 32-bit values, like the real
+    input.
+    """
+    limit = 2 ** 32
+
+    seeds = []
+    for _ in range(scaled(10, scale)):
+        start = rng.randrange(limit)
+        seeds += [start, rng.randint(1, limit // 20)]
+
+    segments = [f"seeds: {' '.join(map(str, seeds))}"]
+    for from_key, to_key in zip(ALMANAC_KEYS, ALMANAC_KEYS[1:]):
+        count = scaled(rng.randint(8, 40), scale)
+        cuts = sorted(rng.sample(range(1, limit), count - 1))
+        starts = [0] + cuts
+        lengths = [end - start for start, end in zip(starts, cuts + [limit])]
+
+        # Lay the same ranges back out in a random order to get their destinations.
+        order = list(range(count))
+        rng.shuffle(order)
+        dests = [0] * count
+        pos = 0
+        for i in order:
+            dests[i] = pos
+            pos += lengths[i]
+
+        rows = [f"{dest} {start} {length}" for dest, start, length in zip(dests, starts, lengths)]
+        rng.shuffle(rows)
+        segments.append('\n'.join([f"{from_key}-to-{to_key} map:"] + rows))
+    return '\n\n'.join(segments)
+
+
+# Day 6
+def generate_day_6(scale: float, rng: Random) -> str:
+    """Races with two digit times and three digit records. The first time starts with a digit of at least 5, so the
+    merged part 2 race can always be won.
+    """
+    times = []
+    records = []
+    for i in range(scaled(4, scale)):
+        time = rng.randint(50 if i == 0 else 30, 99)
+        times.append(time)
+        records.append(rng.randint(100, min(999, time * time // 4 - 1)))
+
+    width = max(len(str(n)) for n in times + records) + 1
+    return '\n'.join([
+        "Time:    " + ''.join(f"{n:>{width}}" for n in times),
+        "Distance:" + ''.join(f"{n:>{width}}" for n in records),
+    ])
+
+
+# Day 7
+def generate_day_7(scale: float, rng: Random) -> str:
+    """Distinct hands of five random cards with bids up to 1000. As in the real input no hand appears twice, since
+    equal hands would have no defined ranking, which caps the scale at around 370. Larger scales are clamped to every
+    distinct hand, with a warning.
+    """
+    cards = "23456789TJQKA"
+    count = scaled(1000, scale)
+    if count > len(cards) ** 5:
+        warnings.warn(f"Day 7 at scale {scale} needs {count} hands, but only {len(cards) ** 5} distinct hands exist. "
+                      f"Generating all of them instead.")
+        count = len(cards) ** 5
+
+    lines = []
+    for n in rng.sample(range(len(cards) ** 5), count):
+        hand = ''.join(cards[n // len(cards) ** i % len(cards)] for i in range(5))
+        lines.append(f"{hand} {rng.randint(1, 1000)}")
+    return '\n'.join(lines)
+
+
+# Day 8
+NODE_CHARS = string.ascii_uppercase + string.digits
+
+
+def _primes_from(n: int, count: int, exclude: set[int]) -> list[int]:
+    """Gets the first "count" primes at or above n that are not excluded."""
+    primes = []
+    while len(primes) < count:
+        if n > 1 and n not in exclude and all(n % d for d in range(2, isqrt(n) + 1)):
+            primes.append(n)
+        n += 1
+    return primes
+
+
+def generate_day_8(scale: float, rng: Random) -> str:
+    """A network of six ghost loops. Each loop is a ring of node pairs, where both nodes of a pair lead to both nodes
+    of the next pair, and the first pair ends in "Z". Every ghost therefore first reaches a Z node after as many steps
+    as its ring is long, and again every ring length after that, like the real input. One ghost starts at "AAA" and
+    has "ZZZ" in its first pair.
+
+    The node names are limited to three characters, which caps the scale at around 80. Larger scales are clamped to
+    the longest rings there are names for, with a warning.
+    """
+    ghosts = 6
+    instruction_length = _primes_from(263, 1, set())[0]
+
+    # Names ending in "A" or "Z" are reserved for the starts and the targets.
+    pool = [a + b + c for a in NODE_CHARS for b in NODE_CHARS for c in NODE_CHARS if c not in "AZ"]
+
+    def names_needed(shortest: int) -> int:
+        return sum(2 * (length - 1) for length in _primes_from(shortest, ghosts, {instruction_length}))
+
+    shortest = scaled(45, scale)
+    if names_needed(shortest) > len(pool):
+        # The names needed only grow with the shortest ring, so the longest rings that fit can be bisected for.
+        low, high = 1, shortest
+        while low < high:
+            mid = (low + high + 1) // 2
+            low, high = (mid, high) if names_needed(mid) <= len(pool) else (low, mid - 1)
+        warnings.warn(f"Day 8 at scale {scale} needs {names_needed(shortest)} node names, but only {len(pool)} "
+                      f"3-character names exist. Generating at scale {low / 45:.4g} instead.")
+        shortest = low
+
+    ring_lengths = _primes_from(shortest, ghosts, {instruction_length})
+    needed = sum(2 * (length - 1) for length in ring_lengths)
+    names = iter(rng.sample(pool, needed))
+
+    starts = ["AAA"] + rng.sample([a + b + "A" for a in NODE_CHARS for b in NODE_CHARS if a + b != "AA"], ghosts - 1)
+    targets = ["ZZZ"] + rng.sample([a + b + "Z" for a in NODE_CHARS for b in NODE_CHARS if a + b != "ZZ"], 2 * ghosts - 1)
+    targets = iter(targets)
+
+    nodes = {}
+    for start, length in zip(starts, ring_lengths):
+        pairs = [(next(targets), next(targets))] + [(next(names), next(names)) for _ in range(length - 1)]
+        for i, pair in enumerate(pairs):
+            following = pairs[(i + 1) % length]
+            for node in pair:
+                # Going left from the last pair always reaches the first node of the first pair, so that the walk from
+                # "AAA" is guaranteed to land on "ZZZ" rather than only ever on its partner.
+                if i == length - 1:
+                    nodes[node] = following
+                else:
+                    nodes[node] = following if rng.random() < 0.5 else following[::-1]
+        nodes[start] = nodes[pairs[0][0]]
+
+    instructions = "L" + ''.join(rng.choices("LR", k=instruction_length - 1))
+    network = [f"{node} = ({left}, {right})" for node, (left, right) in nodes.items()]
+    rng.shuffle(network)
+    return '\n'.join([instructions, ""] + network)
+
+
+# Day 9
+def generate_day_9(scale: float, rng: Random) -> str:
+    """Histories of 21 values of random polynomials of degree up to 8."""
+    lines = []
+    for _ in range(scaled(200, scale)):
+        coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(1, 9))]
+        shift = rng.randint(-10, 10)
+        values = [sum(c * (x + shift) ** k for k, c in enumerate(coefficients)) for x in range(21)]
+        lines.append(' '.join(map(str, values)))
+    return '\n'.join(lines)
+
+
+# Day 10
+PIPE_CHARS = {
+    frozenset("NS"): "|",
+    frozenset("EW"): "-",
+    frozenset("NE"): "L",
+    frozenset("NW"): "J",
+    frozenset("SW"): "7",
+    frozenset("SE"): "F",
+}
+
+
+def _direction(from_loc: tuple[int, int], to_loc: tuple[int, int]) -> str:
+    """Gets the direction of a neighbouring tile."""
+    return {(-1, 0): "N", (1, 0): "S", (0, -1): "W", (0, 1): "E"}[(to_loc[0] - from_loc[0], to_loc[1] - from_loc[1])]
+
+
+def generate_day_10(scale: float, rng: Random) -> str:
+    """A field with a single loop shaped like a skyline: a flat bottom, and a top made of blocks of random width and
+    height. Every tile off the loop is filled with random pipe pieces, except that no piece points into "S" other than
+    its two loop neighbours.
+    """
+    side = max(8, scaled_side(140, scale))
+    bottom, right = side - 2, side - 2
+
+    # Corners of the loop, starting at the bottom left and going up and around clockwise.
+    # Each block's top edge runs from the end of the previous block, where the vertical edge between the two blocks is.
+    corners = [(bottom, 1)]
+    start_x = 1
+    while start_x < right:
+        end_x = min(right, start_x + rng.randint(2, 8) - 1)
+        if right - end_x < 2:
+            end_x = right
+        top = rng.randint(1, bottom - 1)
+        corners += [(top, max(1, start_x - 1)), (top, end_x)]
+        start_x = end_x + 1
+    corners += [(bottom, right), (bottom, 1)]
+
+    loop = []
+    for (r1, c1), (r2, c2) in zip(corners, corners[1:]):
+        dr, dc = (r2 > r1) - (r2 < r1), (c2 > c1) - (c2 < c1)
+        while (r1, c1) != (r2, c2):
+            loop.append((r1, c1))
+            r1, c1 = r1 + dr, c1 + dc
+
+    grid = [[rng.choice("|-LJ7F.") for _ in range(side)] for _ in range(side)]
+    for i, loc in enumerate(loop):
+        dirs = frozenset([_direction(loc, loop[i - 1]), _direction(loc, loop[(i + 1) % len(loop)])])
+        grid[loc[0]][loc[1]] = PIPE_CHARS[dirs]
+
+    start = rng.choice(loop)
+    i = loop.index(start)
+    for neighbour in [(start[0] + dr, start[1] + dc) for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))]:
+        if neighbour not in (loop[i - 1], loop[(i + 1) % len(loop)]):
+            grid[neighbour[0]][neighbour[1]] = "."
+    grid[start[0]][start[1]] = "S"
+
+    return '\n'.join(''.join(row) for row in grid)
+
+
+# Day 11
+def generate_day_11(scale: float, rng: Random) -> str:
+    """An image with galaxies scattered over space, where about one row and column in twenty is left empty."""
+    side = scaled_side(140, scale)
+    empty_rows = {r for r in range(side) if rng.random() < 0.05}
+    empty_cols = {c for c in range(side) if rng.random() < 0.05}
+    return '\n'.join(
+        ''.join(
+            "#" if r not in empty_rows and c not in empty_cols and rng.random() < 0.02 else "."
+            for c in range(side)
+        )
+        for r in range(side)
+    )
+
+
+# Day 12
+def generate_day_12(scale: float, rng: Random) -> str:
+    """Rows of springs made by drawing a random arrangement with at least one broken spring, reading its blocks, then
+    hiding about half of its springs behind "?".
+    """
+    lines = []
+    for _ in range(scaled(1000, scale)):
+        length = rng.randint(4, 20)
+        springs = ''.join(rng.choices(".#", k=length))
+        if "#" not in springs:
+            i = rng.randrange(length)
+            springs = springs[:i] + "#" + springs[i + 1:]
+
+        blocks = [len(b) for b in springs.split(".") if b]
+        masked = ''.join("?" if rng.random() < 0.5 else ch for ch in springs)
+        lines.append(f"{masked} {','.join(map(str, blocks))}")
+    return '\n'.join(lines)
+
+
+# Day 13
+def _mirror(rows: list[list[str]], index: int) -> None:
+    """Copies the rows before the index onto the rows after it, so the rows are symmetrical around the index."""
+    for i in range(min(index, len(rows) - index)):
+        rows[index + i] = list(rows[index - 1 - i])
+
+
+def _symmetry_lines(pattern: list[str], check: Callable[[list[str], int], bool]) -> list[int]:
+    """Finds every line of a pattern that passes the symmetry check, as scored by the puzzle."""
+    rows = [100 * r for r in range(1, len(pattern)) if check(pattern, r)]
+    columns = transpose(pattern)
+    return rows + [c for c in range(1, len(columns)) if check(columns, c)]
+
+
+def _generate_pattern(rng: Random) -> list[str]:
+    """Makes a single pattern with exactly one line of perfect symmetry and exactly one line of symmetry with a single
+    smudge, by mirroring random rows and columns, then flipping one cell that is covered by the column mirror only.
+    """
+    while True:
+        height, width = rng.randint(5, 17), rng.randint(5, 17)
+        row_line = rng.randint(1, height - 1)
+        col_line = rng.randint(1, width - 1)
+        rows_covered = min(row_line, height - row_line)
+        cols_covered = min(col_line, width - col_line)
+
+        # The smudge has to be on a row that the row mirror does not cover.
+        free_rows = [r for r in range(height) if not row_line - rows_covered <= r < row_line + rows_covered]
+        if not free_rows:
+            continue
+
+        grid = [rng.choices("#.", k=width) for _ in range(height)]
+        _mirror(grid, row_line)
+        columns = [list(c) for c in zip(*grid)]
+        _mirror(columns, col_line)
+        grid = [list(r) for r in zip(*columns)]
+
+        r = rng.choice(free_rows)
+        c = rng.randrange(col_line - cols_covered, col_line + cols_covered)
+        grid[r][c] = "." if grid[r][c] == "#" else "#"
+
+        pattern = [''.join(row) for row in grid]
+        if rng.random() < 0.5:
+            pattern = transpose(pattern)
+
+        # Random cells can line up into extra lines of symmetry, so only keep patterns with a single answer.
+        if len(_symmetry_lines(pattern, has_symmetry)) == 1 and len(_symmetry_lines(pattern, has_single_difference)) == 1:
+            return pattern
+
+
+def generate_day_13(scale: float, rng: Random) -> str:
+    """Patterns of 5 to 17 rows and columns, each with one line of symmetry and one line of symmetry with a smudge."""
+    return '\n\n'.join('\n'.join(_generate_pattern(rng)) for _ in range(scaled(100, scale)))
+
+
+# Day 14
+def generate_day_14(scale: float, rng: Random) -> str:
+    """A platform of rounded rocks, cube rocks and empty space."""
+    side = scaled_side(100, scale)
+    return '\n'.join(''.join(rng.choices("O#.", weights=(20, 8, 72), k=side)) for _ in range(side))
+
+
+# Day 15
+def generate_day_15(scale: float, rng: Random) -> str:
+    """Steps that set or remove lenses using a pool of a few hundred labels."""
+    labels = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 6))) for _ in range(500)]
+    steps = []
+    for _ in range(scaled(4000, scale)):
+        label = rng.choice(labels)
+        steps.append(f"{label}={rng.randint(1, 9)}" if rng.random() < 0.6 else f"{label}-")
+    return ','.join(steps)
+
+
+GENERATORS: dict[int, Callable[[float, Random], str]] = {
+    1: generate_day_1,
+    2: generate_day_2,
+    3: generate_day_3,
+    4: generate_day_4,
+    5: generate_day_5,
+    6: generate_day_6,
+    7: generate_day_7,
+    8: generate_day_8,
+    9: generate_day_9,
+    10: generate_day_10,
+    11: generate_day_11,
+    12: generate_day_12,
+    13: generate_day_13,
+    14: generate_day_14,
+    15: generate_day_15,
+}
+
+
+def generate_input(day: int, scale: float = 1, seed: int | None = None) -> str:
+    """Generates a synthetic input for a day at the given scale. The same seed always gives the same input.
+
+    >>> generate_input(7, scale=0.005, seed=1)
+    >>> "4T3K9 208\\n..."
+    """
+    if day not in GENERATORS:
+        raise ValueError(f"No input generator exists for day {day}.")
+
+    return GENERATORS[day](scale, Random(seed))
+
+
+def parse_args():
+    parser = ArgumentParser(description="Generate synthetic Advent of Code 2023 inputs.")
+    parser.add_argument(
+        "--days",
+        type=parse_int_list,
+        default=None,
+        help="Comma separated days or day ranges to generate, e.g. '1-3,5,12'. Defaults to every day.",
+    )
+    parser.add_argument("--scale", type=float, default=1, help="Size relative to a real input. Defaults to 1.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the random number generator.")
+    parser.add_argument("--output-dir", default="generated", help="Directory to write 'day_N.txt' files to.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    makedirs(args.output_dir, exist_ok=True)
+    for day in args.days or sorted(GENERATORS):
+        out_file = path.join(args.output_dir, f"day_{day}.txt")
+        write_atomic(out_file, generate_input(day, scale=args.scale, seed=args.seed))
+        print(f"Day {day}: {out_file}")
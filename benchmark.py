@@ -0,0 +1,167 @@
+import json
+import sys
+from argparse import ArgumentParser
+from platform import python_version
+from statistics import median
+
+from aoc2023 import *
+from core.input_reader import save_day_inputs
+from core.util_methods import parse_int_list
+from main import run_day
+
+
+def percentile(vals: list[float], pct: float) -> float:
+    """Gets the given percentile of a list of values using the nearest-rank method.
+
+    >>> percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 95)
+    >>> 10
+    """
+    ordered = sorted(vals)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Gets the min, median and p95 of a list of timing samples."""
+    return {
+        "min": min(samples),
+        "median": median(samples),
+        "p95": percentile(samples, 95),
+    }
+
+
+def benchmark_day(day: int, repeats: int, warmup: int) -> dict[str, float | list[float] | dict]:
+    """Runs a single day "warmup" times without recording anything, to get first-call effects such as imports and
+    cold caches out of the way, then "repeats" more times while recording the wall-clock time of each run, along with
+    the time spent in each of the day's phases.
+    """
+    for _ in range(warmup):
+        run_day(day)
+
+    runs = [run_day(day) for _ in range(repeats)]
+    samples = [run.wall for run in runs]
+    phases = runs[0].result.timings.keys()
+
+    return {
+        **summarize(samples),
+        "samples": samples,
+        "phases": {phase: summarize([run.result.timings[phase] for run in runs]) for phase in phases},
+    }
+
+
+def compare_to_baseline(
+        results: dict[str, dict],
+        baseline: dict[str, dict],
+        threshold: float,
+) -> list[tuple[str, float, float]]:
+    """Compares the median runtime of each benchmarked day to the same day in a baseline, returning the day, baseline
+    median and current median of every day that got slower by more than the threshold fraction.
+
+    >>> compare_to_baseline({"1": {"median": 0.5}}, {"1": {"median": 0.4}}, 0.1)
+    >>> [("1", 0.4, 0.5)]
+    """
+    regressions = []
+    for day, stats in results.items():
+        if day not in baseline:
+            continue
+
+        old, new = baseline[day]["median"], stats["median"]
+        if new > old * (1 + threshold):
+            regressions.append((day, old, new))
+
+    return regressions
+
+
+def run_benchmarks(
+        days: list[int],
+        repeats: int,
+        warmup: int,
+        output: str,
+        baseline: str | None = None,
+        threshold: float = 0.1,
+) -> bool:
+    """Benchmarks the given days, writes the results to the output JSON file and prints a summary.
+
+    Returns False if a baseline was given and any day regressed past the threshold, otherwise True.
+    """
+    save_day_inputs(days)
+
+    results = {}
+    phase_names = ("parse", "part_1", "part_2")
+    print(f"{'Day':>4} {'Min':>12} {'Median':>12} {'P95':>12}", *(f"{p:>12}" for p in phase_names))
+    for day in days:
+        stats = benchmark_day(day, repeats, warmup)
+        results[str(day)] = stats
+        # Phase columns show the median time spent in each phase.
+        print(
+            f"{day:>4} {stats['min']:>12.6f} {stats['median']:>12.6f} {stats['p95']:>12.6f}",
+            *(f"{stats['phases'][p]['median']:>12.6f}" if p in stats['phases'] else f"{'-':>12}" for p in phase_names),
+        )
+
+    with open(output, "w") as f:
+        json.dump(
+            {
+                "python": python_version(),
+                "repeats": repeats,
+                "warmup": warmup,
+                "days": results,
+            },
+            f,
+            indent=2,
+        )
+
+    print(f"\nResults written to {output}")
+
+    if baseline is None:
+        return True
+
+    with open(baseline, "r") as f:
+        baseline_results = json.load(f)["days"]
+
+    regressions = compare_to_baseline(results, baseline_results, threshold)
+    for day, old, new in regressions:
+        print(f"Day {day} regressed: median {old:.6f} -> {new:.6f} seconds ({(new / old - 1) * 100:+.1f}%)")
+
+    if not regressions:
+        print(f"No days regressed by more than {threshold * 100:.0f}% against {baseline}")
+
+    return not regressions
+
+
+def parse_args():
+    parser = ArgumentParser(description="Benchmark the Advent of Code 2023 solutions.")
+    parser.add_argument(
+        "--days",
+        type=parse_int_list,
+        default=None,
+        help="Comma separated days or day ranges to benchmark, e.g. '1-3,5,12'. Defaults to every implemented day.",
+    )
+    parser.add_argument("--repeats", type=int, default=10, help="Number of recorded runs per day.")
+    parser.add_argument("--warmup", type=int, default=1, help="Number of unrecorded runs per day before recording.")
+    parser.add_argument("--output", default="benchmark.json", help="Path of the JSON file to write results to.")
+    parser.add_argument("--baseline", default=None, help="Path of a previous results file to compare against.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Fraction a day's median may grow by over the baseline before it is flagged, e.g. 0.1 for 10%%.",
+    )
+    args = parser.parse_args()
+    if args.repeats < 1:
+        parser.error("--repeats must be at least 1.")
+    if args.warmup < 0:
+        parser.error("--warmup cannot be negative.")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    ok = run_benchmarks(
+        days=args.days or sorted(DAY_MODULES),
+        repeats=args.repeats,
+        warmup=args.warmup,
+        output=args.output,
+        baseline=args.baseline,
+        threshold=args.threshold,
+    )
+    sys.exit(0 if ok else 1)
@@ -1,36 +1,167 @@
-from urllib.request import urlopen, Request
-from os import getenv, path, environ, mkdir
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection, HTTPSConnection, HTTPException
+from os import getenv, path, environ, mkdir, fdopen, remove, replace, chmod, stat, umask
+from stat import S_IMODE
+from tempfile import mkstemp
+from typing import Iterable, Iterator, TextIO
+from urllib.parse import urlsplit
+
+
+AOC_URL = "https://adventofcode.com"
+# Stores the ETag and Last-Modified validators of every downloaded input, used to make refreshes conditional.
+VALIDATORS_FILE = ".validators.json"
+
+
+# The project root and the contents of every input read so far are cached for the lifetime of the process, so that
+# repeated runs (benchmarks, batch runs) do not touch the filesystem again. Use clear_input_cache to invalidate them.
+_root: str | None = None
+_input_cache: dict[int, str] = {}
+
+# The process umask, read once at import since it can only be read by setting it, which is unsafe once the download
+# threads are running.
+_umask = umask(0)
+umask(_umask)
 
 
 def root() -> str | None:
+    global _root
+
+    if _root is not None:
+        return _root
+
     src = './'
 
     for _ in range(3):
         env = path.join(path.abspath(src), '.env')
         if path.exists(env):
-            return path.abspath(src)
+            _root = path.abspath(src)
+            return _root
         else:
             src = f"../{src}"
 
 
+def clear_input_cache(day: int | None = None) -> None:
+    """Drops the cached input for a single day, or the cached input of every day along with the cached project root
+    if no day is given.
+    """
+    global _root
+
+    if day is not None:
+        _input_cache.pop(day, None)
+        return
+
+    _input_cache.clear()
+    _root = None
+
+
 def loadenv() -> None:
-    src = './'
+    rt = root()
 
-    for _ in range(3):
-        env = path.join(path.abspath(src), '.env')
-        if path.exists(env):
-            with open(env, "r") as f:
-                lines = [l.strip().split("=") for l in f.readlines()]
-                for k, v in lines:
-                    environ[k] = v
-                return
-        else:
-            src = f"../{src}"
+    if rt is None:
+        raise EnvironmentError(".env file not found.")
+
+    with open(path.join(rt, '.env'), "r") as f:
+        lines = [l.strip().split("=") for l in f.readlines()]
+        for k, v in lines:
+            environ[k] = v
+
+
+def write_atomic(file: str, content: str) -> None:
+    """Writes content to a file by writing a temporary file next to it and moving it into place, so that an
+    interrupted write never leaves a truncated file behind.
+
+    The temporary file is created readable by its owner only, so it is given the mode of the file it replaces, or the
+    mode a newly created file would have, before being moved into place.
+    """
+    mode = S_IMODE(stat(file).st_mode) if path.exists(file) else 0o666 & ~_umask
+    fd, tmp = mkstemp(dir=path.dirname(file), prefix=f".{path.basename(file)}.", suffix=".tmp")
+    try:
+        with fdopen(fd, "w") as f:
+            f.write(content)
+        chmod(tmp, mode)
+        replace(tmp, file)
+    except BaseException:
+        if path.exists(tmp):
+            remove(tmp)
+        raise
+
+
+def _connect(base_url: str) -> HTTPConnection:
+    """Opens a persistent connection to the host of the base URL."""
+    url = urlsplit(base_url)
+    conn_type = HTTPSConnection if url.scheme == "https" else HTTPConnection
+    return conn_type(url.netloc, timeout=30)
+
+
+def _download_day_input(
+        day: int,
+        inp_file: str,
+        base_url: str,
+        session_key: str,
+        validators: dict[str, str] | None,
+        local: threading.local,
+        connections: list[HTTPConnection],
+) -> dict[str, str] | None:
+    """Downloads the input for a single day into its input file, reusing the calling thread's connection.
+
+    If validators from a previous download are given, the request is made conditional on them and an unchanged input
+    is not transferred again. Returns the validators of the downloaded input, or None if it was unchanged.
+    """
+    if not hasattr(local, "conn"):
+        local.conn = _connect(base_url)
+        connections.append(local.conn)
+
+    headers = {"Cookie": f"session={session_key}"}
+    if validators:
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    request_path = f"{urlsplit(base_url).path.rstrip('/')}/2023/day/{day}/input"
+
+    # A kept-alive connection may have been dropped by the server since its last use, in which case it is reopened
+    # and the request is tried once more.
+    for attempt in range(2):
+        try:
+            local.conn.request("GET", request_path, headers=headers)
+            response = local.conn.getresponse()
+            body = response.read()
+            break
+        except (ConnectionError, HTTPException):
+            local.conn.close()
+            if attempt:
+                raise
 
-    raise EnvironmentError(".env file not found.")
+    if response.status == 304:
+        return None
 
+    if response.status != 200:
+        raise ConnectionError(f"Failed to download input for day {day}: {response.status} {response.reason}")
 
-def save_day_inputs(days: list[int] = None) -> None:
+    write_atomic(inp_file, body.decode('utf-8').strip())
+
+    return {
+        k: v for k, v in (
+            ("etag", response.getheader("ETag")),
+            ("last_modified", response.getheader("Last-Modified")),
+        ) if v
+    }
+
+
+def save_day_inputs(
+        days: list[int] = None,
+        refresh: bool = False,
+        workers: int = 4,
+        base_url: str = AOC_URL,
+) -> None:
+    """Downloads the input of every given day that does not exist yet over a bounded pool of threads.
+
+    With refresh set, days that already have an input are requested again, conditionally on the validators (ETag and
+    Last-Modified) stored from their last download, so that only inputs that changed are transferred.
+    """
     days = days or list(range(1, 26, 1))
 
     loadenv()
@@ -43,17 +174,50 @@ def save_day_inputs(days: list[int] = None) -> None:
     if not session_key:
         raise EnvironmentError("AoC2023SessionKey environment variables missing.")
 
-    for day in days:
-        inp_file = path.join(rt, 'input', f'day_{day}.txt')
-        if not path.exists(inp_file):
-            req = Request(f"https://adventofcode.com/2023/day/{day}/input")
-            req.add_header("Cookie", f"session={session_key}")
-            with urlopen(req) as response:
-                with open(inp_file, "w+") as input_file:
-                    input_file.write(response.read().decode('utf-8').strip())
+    validators_file = path.join(rt, 'input', VALIDATORS_FILE)
+    validators = {}
+    if path.exists(validators_file):
+        with open(validators_file, "r") as f:
+            validators = json.load(f)
 
+    inp_files = {day: path.join(rt, 'input', f'day_{day}.txt') for day in days}
+    to_download = [day for day, inp_file in inp_files.items() if refresh or not path.exists(inp_file)]
+    if not to_download:
+        return
 
-def get_day_input(day: int) -> str:
+    local = threading.local()
+    connections = []
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                day: executor.submit(
+                    _download_day_input,
+                    day,
+                    inp_files[day],
+                    base_url,
+                    session_key,
+                    validators.get(str(day)) if path.exists(inp_files[day]) else None,
+                    local,
+                    connections,
+                )
+                for day in to_download
+            }
+
+        for day, future in futures.items():
+            day_validators = future.result()
+            if day_validators is not None:
+                validators[str(day)] = day_validators
+                clear_input_cache(day)
+    finally:
+        for conn in connections:
+            conn.close()
+
+        write_atomic(validators_file, json.dumps(validators, indent=2))
+
+
+def get_day_input_file(day: int) -> str:
+    """Gets the path of the input file for a day, downloading it first if it does not exist yet."""
     rt = root()
 
     inp_file = path.join(rt, 'input', f'day_{day}.txt')
@@ -64,5 +228,71 @@ def get_day_input(day: int) -> str:
     if not path.exists(inp_file):
         raise EnvironmentError(f"Failed to load day input for file: {inp_file}")
 
-    with open(inp_file, "r") as inp:
-        return inp.read().strip()
+    return inp_file
+
+
+def get_day_input(day: int) -> str:
+    if day in _input_cache:
+        return _input_cache[day]
+
+    with open(get_day_input_file(day), "r") as inp:
+        _input_cache[day] = inp.read().strip()
+
+    return _input_cache[day]
+
+
+def iter_lines(file: str | TextIO) -> Iterator[str]:
+    """Yields the lines of a file (or an open text stream, such as stdin) one at a time, without their line endings.
+
+    Blank lines at the start and end of the file are dropped, matching the stripping done by get_day_input, so only one
+    line (plus any run of blank lines) is held in memory at a time.
+    """
+    if isinstance(file, str):
+        with open(file, "r") as f:
+            yield from iter_lines(f)
+        return
+
+    started = False
+    blank_lines = 0
+    for line in file:
+        line = line.rstrip("\r\n")
+
+        if not line.strip():
+            # Blank lines are held back until a non-blank line follows, so that trailing ones can be dropped.
+            blank_lines += started
+            continue
+
+        yield from [""] * blank_lines
+        blank_lines = 0
+        started = True
+        yield line
+
+
+def iter_blocks(lines: Iterable[str]) -> Iterator[list[str]]:
+    """Groups lines into blocks separated by blank lines, yielding one block at a time.
+
+    >>> list(iter_blocks(["#.#", "..#", "", "##.", "#.."]))
+    >>> [["#.#", "..#"], ["##.", "#.."]]
+    """
+    block = []
+    for line in lines:
+        if line:
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+
+    if block:
+        yield block
+
+
+def iter_day_lines(day: int) -> Iterator[str]:
+    """Streams the lines of a day's input file without reading the whole file into memory."""
+    return iter_lines(get_day_input_file(day))
+
+
+def iter_day_blocks(day: int) -> Iterator[list[str]]:
+    """Streams the blank line separated blocks of a day's input file, such as the almanac maps of day 5 or the
+    patterns of day 13, without reading the whole file into memory.
+    """
+    return iter_blocks(iter_day_lines(day))
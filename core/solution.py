@@ -0,0 +1,97 @@
+from time import perf_counter
+from typing import Any, Callable, Iterable
+
+from core.input_reader import get_day_input, iter_day_lines
+
+
+class DayResult:
+    """Holds the answers from a single solve of a day, along with the time spent in each of its phases.
+
+    The phases are "read" (loading the input, only present if the input was not passed in directly), "parse",
+    "part_1" and "part_2".
+    """
+    day: int
+    answers: dict[int, Any]
+    timings: dict[str, float]
+
+    def __init__(self, day: int):
+        self.day = day
+        self.answers = {}
+        self.timings = {}
+
+    @property
+    def total(self) -> float:
+        """The total time spent across all phases."""
+        return sum(self.timings.values())
+
+    def __str__(self) -> str:
+        """Formats the answers the same way every day prints them.
+
+        >>> print(solve_day(6, parse, part_1, part_2))
+        >>> Part 1: 288
+            Part 2: 71503
+        """
+        return '\n'.join(f"Part {part}: {answer}" for part, answer in self.answers.items())
+
+    def __repr__(self) -> str:
+        return f"<DayResult day={self.day} answers={self.answers} timings={self.timings}>"
+
+
+def solve_day(
+        day: int,
+        parse: Callable[[str], Any],
+        part_1: Callable[[Any], Any],
+        part_2: Callable[[Any], Any],
+        content: str | None = None,
+        part: int | None = None,
+) -> DayResult:
+    """Solves a day by reading its input (unless the content is given), parsing it once, and then passing the parsed
+    input to each selected part, timing every phase separately.
+
+    >>> solve_day(6, parse, part_1, part_2)
+    >>> <DayResult day=6 answers={1: 288, 2: 71503} timings={'read': 0.0001, 'parse': ...}>
+    """
+    result = DayResult(day)
+
+    if content is None:
+        start = perf_counter()
+        content = get_day_input(day)
+        result.timings["read"] = perf_counter() - start
+
+    start = perf_counter()
+    data = parse(content)
+    result.timings["parse"] = perf_counter() - start
+
+    for n, method in ((1, part_1), (2, part_2)):
+        if part in (None, n):
+            start = perf_counter()
+            result.answers[n] = method(data)
+            result.timings[f"part_{n}"] = perf_counter() - start
+
+    return result
+
+
+def stream_day(
+        day: int,
+        stream: Callable[[Iterable[str], int | None], dict[int, Any]],
+        lines: Iterable[str] | None = None,
+        part: int | None = None,
+) -> DayResult:
+    """Solves a day in a single pass over its lines (streamed from its input file unless given), for days that can
+    solve without holding the whole input in memory.
+
+    Reading, parsing and solving are interleaved while streaming, so they are timed together as a single "stream" phase.
+
+    >>> stream_day(1, stream)
+    >>> <DayResult day=1 answers={1: 142, 2: 142} timings={'stream': 0.0002}>
+    """
+    result = DayResult(day)
+
+    if lines is None:
+        lines = iter_day_lines(day)
+
+    start = perf_counter()
+    result.answers = stream(lines, part)
+    result.timings["stream"] = perf_counter() - start
+
+    return result
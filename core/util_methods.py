@@ -8,3 +8,23 @@ def product(vals: list[int | float]) -> int | float:
     >>> 24
     """
     return reduce(lambda x, y: x * y, vals)
+
+
+def parse_int_list(inp: str) -> list[int]:
+    """Parse a comma separated list of integers and inclusive integer ranges, as used for picking days on the command
+    line.
+
+    >>> parse_int_list("1-3,5,12")
+    >>> [1, 2, 3, 5, 12]
+    """
+    vals = []
+    for seg in inp.split(','):
+        seg = seg.strip()
+        if not seg:
+            continue
+        if '-' in seg:
+            start, end = map(int, seg.split('-'))
+            vals.extend(range(start, end + 1))
+        else:
+            vals.append(int(seg))
+    return vals
@@ -1,4 +1,4 @@
-from core.input_reader import get_day_input
+from core.solution import DayResult, solve_day
 
 
 # Input Parsing
@@ -7,15 +7,26 @@ from core.input_reader import get_day_input
 # Processing
 
 
-def main() -> None:
-    # Read Input
-    day = 0
-    lines = get_day_input(day).splitlines()
+# Phases
+def parse(content: str) -> list[str]:
+    return content.splitlines()
 
-    # Part 1
 
-    # Part 2
+def part_1(lines: list[str]) -> int:
+    pass
+
+
+def part_2(lines: list[str]) -> int:
+    pass
+
+
+def solve(content: str | None = None, part: int | None = None) -> DayResult:
+    return solve_day(0, parse, part_1, part_2, content=content, part=part)
+
+
+def main(part: int | None = None) -> None:
+    print(solve(part=part))
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
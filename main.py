@@ -1,25 +1,356 @@
-from time import time
+import csv
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from cProfile import Profile
+from glob import glob
+from os import makedirs, path
+from pstats import Stats
+from itertools import repeat
+from time import perf_counter, process_time
+from typing import NamedTuple
 
 from aoc2023 import *
-from core.input_reader import save_day_inputs
+from core.input_reader import iter_lines, save_day_inputs
+from core.solution import DayResult, stream_day
+from core.util_methods import parse_int_list
 
 
-def run_all_days():
-    print(f"------ Getting Inputs for Days 1-{len(DAY_METHODS)} ------", end='\n\n')
-    save_day_inputs(list(range(1, len(DAY_METHODS)+1, 1)))
+class DayRun(NamedTuple):
+    """The result and timings of a single run of a day."""
+    day: int
+    result: DayResult
+    import_time: float
+    wall: float
+    cpu: float
 
-    all_start = time()
 
-    for i, method in enumerate(DAY_METHODS, 1):
-        print(f"------ Day {i} ------")
-        day_start = time()
-        method()
-        day_end = time()
-        print(f"------ {day_end - day_start:.4} seconds ------", end="\n\n")
+def run_day(
+        day: int,
+        part: int | None = None,
+        content: str | None = None,
+        input_file: str | None = None,
+        stream: bool = False,
+) -> DayRun:
+    """Runs a single day (or a single part of it), returning its result along with the time it took to import the day
+    and the wall-clock and CPU time it took to solve. The day reads its own input unless the content or an input file
+    is given.
 
-    all_end = time()
+    With stream set, days that can solve in a single pass over their lines are streamed their input line by line,
+    rather than reading it into memory. Other days are solved normally.
+
+    This is the unit of work for both the sequential and the parallel runner, so it has to stay a module level function
+    for the process pool to be able to send it to the workers.
+
+    >>> run_day(6)
+    >>> DayRun(day=6, result=<DayResult day=6 answers={1: 288, 2: 71503} ...>, import_time=0.0004, wall=0.0012, ...)
+    """
+    module, import_time = load_day(day)
+    stream = stream and hasattr(module, "stream")
+
+    lines = None
+    if stream and input_file is not None:
+        lines = iter_lines(input_file)
+    elif stream and content is not None:
+        lines = iter(content.splitlines())
+    elif input_file is not None:
+        with open(input_file, "r") as f:
+            content = f.read().strip()
+
+    wall_start, cpu_start = perf_counter(), process_time()
+    if stream:
+        result = stream_day(day, module.stream, lines=lines, part=part)
+    else:
+        result = module.solve(content=content, part=part)
+    wall_end, cpu_end = perf_counter(), process_time()
+
+    return DayRun(day, result, import_time, wall_end - wall_start, cpu_end - cpu_start)
+
+
+def format_timings(timings: dict[str, float]) -> str:
+    """Formats the per-phase timings of a day result for display.
+
+    >>> format_timings({"read": 0.0001, "parse": 0.0002, "part_1": 0.0003})
+    >>> "read 0.0001, parse 0.0002, part_1 0.0003"
+    """
+    return ', '.join(f"{phase} {seconds:.4}" for phase, seconds in timings.items())
+
+
+def get_inputs(
+        days: list[int],
+        input_file: str | None = None,
+        scale: float | None = None,
+        seed: int | None = None,
+) -> tuple[list[str | None], list[str | None]]:
+    """Gets the input content and the input file to run each day against, in day order.
+
+    If an input file is given, every day is run against it, after replacing any "{day}" in the path with the day
+    number. If a scale is given, an input of that scale is generated for every day. Otherwise, the real inputs are
+    downloaded where missing, and each day reads its own input.
+    """
+    if input_file is not None:
+        print(f"------ Reading Inputs from {input_file} ------", end='\n\n')
+        return [None] * len(days), [input_file.replace("{day}", str(day)) for day in days]
+
+    if scale is not None:
+        # The generators import some of the days they generate for, so they are only loaded when they are needed, to
+        # keep the days lazily imported otherwise.
+        from aoc2023.generators import generate_input
+
+        print(f"------ Generating Inputs at Scale {scale} (seed {seed}) ------", end='\n\n')
+        return [generate_input(day, scale=scale, seed=seed) for day in days], [None] * len(days)
+
+    print(f"------ Getting Inputs for Days {', '.join(map(str, days))} ------", end='\n\n')
+    save_day_inputs(days)
+    return [None] * len(days), [None] * len(days)
+
+
+def run_all_days(
+        days: list[int] | None = None,
+        part: int | None = None,
+        parallel: bool = False,
+        workers: int | None = None,
+        input_file: str | None = None,
+        scale: float | None = None,
+        seed: int | None = None,
+        stream: bool = False,
+):
+    days = days or sorted(DAY_MODULES)
+    contents, input_files = get_inputs(days, input_file=input_file, scale=scale, seed=seed)
+
+    all_start = perf_counter()
+    cpu_total = 0
+    import_total = 0
+
+    # Days share no state, so in parallel mode each one is sent to a worker process. Results still come back (and are
+    # printed) in day order, as the executor's map preserves the order of its inputs.
+    if parallel:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(run_day, days, repeat(part), contents, input_files, repeat(stream))
+    else:
+        executor = None
+        results = map(run_day, days, repeat(part), contents, input_files, repeat(stream))
+
+    # The results are printed as they arrive, so the pool has to outlive the loop, and is shut down (dropping any days
+    # not yet started) even if a day fails.
+    try:
+        for day, result, import_time, wall, cpu in results:
+            print(f"------ Day {day} ------")
+            print(result)
+            print(f"------ {format_timings(result.timings)} ------")
+            print(f"------ {wall:.4} seconds ({cpu:.4} CPU, {import_time:.4} import) ------", end="\n\n")
+            cpu_total += cpu
+            import_total += import_time
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+    all_end = perf_counter()
     print(f"Full Runtime: {all_end - all_start:.4} seconds")
+    print(f"Summed CPU Time: {cpu_total:.4} seconds")
+    print(f"Summed Import Time: {import_total:.4} seconds")
+
+
+def find_batch_inputs(pattern: str) -> list[str]:
+    """Finds the input files for a batch run, being every file in a directory, or every file matching a glob."""
+    if path.isdir(pattern):
+        pattern = path.join(pattern, "*")
+    return sorted(f for f in glob(pattern) if path.isfile(f))
+
+
+def run_batch(
+        day: int,
+        pattern: str,
+        part: int | None = None,
+        workers: int | None = None,
+        output: str | None = None,
+        stream: bool = False,
+):
+    """Solves a single day against every input file in a directory or matching a glob, spread across a pool of
+    worker processes, then prints a table of the answers and timings for each file and optionally writes it to a CSV
+    file.
+    """
+    input_files = find_batch_inputs(pattern)
+    if not input_files:
+        raise FileNotFoundError(f"No input files found for: {pattern}")
+
+    print(f"------ Day {day}: Solving {len(input_files)} Inputs ------", end='\n\n')
+
+    all_start = perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        runs = list(executor.map(run_day, repeat(day), repeat(part), repeat(None), input_files, repeat(stream)))
+    all_end = perf_counter()
+
+    parts = [n for n in (1, 2) if part in (None, n)]
+    phases = sorted({phase for run in runs for phase in run.result.timings})
+    header = ["file"] + [f"part {n}" for n in parts] + phases + ["seconds"]
+    rows = [
+        [f] + [run.result.answers.get(n) for n in parts] + [f"{run.result.timings.get(p, 0):.6f}" for p in phases]
+        + [f"{run.wall:.6f}"]
+        for f, run in zip(input_files, runs)
+    ]
+
+    widths = [max(len(str(v)) for v in col) for col in zip(header, *rows)]
+    for row in [header] + rows:
+        print("  ".join(f"{str(v):<{w}}" for v, w in zip(row, widths)).rstrip())
+
+    print()
+    print(f"Full Runtime: {all_end - all_start:.4} seconds")
+    print(f"Summed Solve Time: {sum(run.wall for run in runs):.4} seconds")
+
+    if output is not None:
+        with open(output, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+        print(f"Results written to {output}")
+
+
+def profile_days(
+        days: list[int] | None = None,
+        part: int | None = None,
+        profile_dir: str = "profiles",
+        top: int = 15,
+        input_file: str | None = None,
+        scale: float | None = None,
+        seed: int | None = None,
+):
+    """Runs each day under cProfile, saving the stats of each day to "day_N.prof" in the profile directory and printing
+    the top functions of each day by cumulative time and by self time.
+
+    The saved stats can be explored further with the pstats module or a viewer such as snakeviz.
+    """
+    days = days or sorted(DAY_MODULES)
+    contents, input_files = get_inputs(days, input_file=input_file, scale=scale, seed=seed)
+
+    makedirs(profile_dir, exist_ok=True)
+
+    for day, content, day_input_file in zip(days, contents, input_files):
+        module, _ = load_day(day)
+
+        if day_input_file is not None:
+            with open(day_input_file, "r") as f:
+                content = f.read().strip()
+
+        profiler = Profile()
+        result = profiler.runcall(module.solve, content=content, part=part)
+
+        stats_file = path.join(profile_dir, f"day_{day}.prof")
+        profiler.dump_stats(stats_file)
+
+        print(f"------ Day {day} ------")
+        print(result)
+        print(f"------ Stats saved to {stats_file} ------")
+
+        stats = Stats(profiler).strip_dirs()
+        for sort_key, label in (("cumulative", "Cumulative Time"), ("tottime", "Self Time")):
+            print(f"------ Top {top} by {label} ------")
+            stats.sort_stats(sort_key).print_stats(top)
+
+
+def parse_args():
+    parser = ArgumentParser(description="Run the Advent of Code 2023 solutions.")
+    parser.add_argument(
+        "--days",
+        type=parse_int_list,
+        default=None,
+        help="Comma separated days or day ranges to run, e.g. '1-3,5,12'. Defaults to every implemented day.",
+    )
+    parser.add_argument(
+        "--part",
+        type=int,
+        choices=(1, 2),
+        default=None,
+        help="Only run the given part of each day. Defaults to both parts.",
+    )
+    parser.add_argument(
+        "--input",
+        default=None,
+        help="Input file to run the days against instead of their real inputs. Any '{day}' in the path is replaced "
+             "with the day number, e.g. 'generated/day_{day}.txt'.",
+    )
+    parser.add_argument(
+        "--generate",
+        type=float,
+        default=None,
+        metavar="SCALE",
+        help="Run the days against generated inputs of the given scale relative to a real input, e.g. 50.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed for the random number generator used by --generate.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the input line by line to the days that can solve in a single pass, instead of reading it "
+             "into memory.",
+    )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Run the days across a pool of worker processes instead of one after another.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes to use with --parallel. Defaults to the number of CPUs.",
+    )
+    parser.add_argument(
+        "--batch",
+        default=None,
+        metavar="INPUTS",
+        help="Solve a single day (picked with --days) against every input file in a directory or matching a glob, "
+             "across a pool of worker processes.",
+    )
+    parser.add_argument(
+        "--batch-output",
+        default=None,
+        help="CSV file to write the answers and timings of each input file of a --batch run to.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Run the days under cProfile, saving their stats and printing their hottest functions.",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default="profiles",
+        help="Directory to save the stats of each profiled day to. Defaults to 'profiles'.",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="Number of functions to list for each day with --profile. Defaults to 15.",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    run_all_days()
+    args = parse_args()
+    inputs = {"input_file": args.input, "scale": args.generate, "seed": args.seed}
+    if args.batch:
+        if not args.days or len(args.days) != 1:
+            raise SystemExit("--batch needs exactly one day to be picked with --days.")
+        run_batch(
+            args.days[0],
+            args.batch,
+            part=args.part,
+            workers=args.workers,
+            output=args.batch_output,
+            stream=args.stream,
+        )
+    elif args.profile:
+        profile_days(days=args.days, part=args.part, profile_dir=args.profile_dir, top=args.top, **inputs)
+    else:
+        run_all_days(
+            days=args.days,
+            part=args.part,
+            parallel=args.parallel,
+            workers=args.workers,
+            stream=args.stream,
+            **inputs,
+        )